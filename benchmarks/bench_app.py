@@ -0,0 +1,269 @@
+"""
+Benchmark the hot paths of the observe application in-process with the httpx
+ASGI transport, so the result does not include any network overhead. Each
+scenario reports the requests per second and the latency percentiles, and the
+result can save as a baseline for comparing with the other commits.
+
+    (env) $ python ./benchmarks/bench_app.py --save main
+    (env) $ python ./benchmarks/bench_app.py --compare main
+    (env) $ python ./benchmarks/bench_app.py --scenarios list search
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from collections.abc import Awaitable
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+BASELINES: Path = Path(__file__).parent / "baselines"
+SCENARIOS: tuple[str, ...] = ("ingest", "list", "search", "page", "login")
+
+# NOTE: The login scenario hashes the password with bcrypt, so it runs with
+#   the smaller number of requests than the others.
+LOGIN_RATIO: int = 20
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def summary(latencies: list[float], elapsed: float, errors: int) -> dict:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+async def load(
+    request: Callable[[int], Awaitable[Any]],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """Run the request function with the concurrent workers and return the
+    summary of its latencies.
+    """
+    latencies: list[float] = []
+    errors: int = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start: float = time.perf_counter()
+            response = await request(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start: float = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summary(latencies, time.perf_counter() - start, errors)
+
+
+async def main(
+    scenarios: list[str],
+    requests: int,
+    concurrency: int,
+    workflows: int,
+    logs: int,
+) -> dict[str, dict]:
+    from ddeutil.observe.app import app
+    from ddeutil.observe.conf import config
+    from ddeutil.observe.utils import get_logger
+    from httpx import ASGITransport, AsyncClient
+
+    # NOTE: Hide the slow query warnings of the profiler on the load.
+    get_logger("ddeutil.observe").setLevel("ERROR")
+    login_data: dict[str, str] = {
+        "username": config.WEB_ADMIN_USER,
+        "password": config.WEB_ADMIN_PASS,
+        "grant_type": "password",
+    }
+    results: dict[str, dict] = {}
+
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for i in range(workflows):
+                await client.post(
+                    "/api/v1/workflow/",
+                    json={
+                        "name": f"wf-bench-{i:05d}",
+                        "params": {"asat-dt": {"type": "datetime"}},
+                        "on": [{"cronjob": "*/3 * * * *"}],
+                        "jobs": {"some-job": {"stages": [{"name": "Empty"}]}},
+                    },
+                )
+
+            response = await client.post(
+                "/auth/login", data=login_data, follow_redirects=False
+            )
+            assert response.status_code == 302
+            cookies: dict[str, str] = {
+                "refresh_token": response.cookies["refresh_token"].strip('"')
+            }
+
+            async def ingest(i: int):
+                return await client.post(
+                    f"/api/v1/workflow/wf-bench-{i % workflows:05d}/release",
+                    json={
+                        "release": str(20240902000000 + i),
+                        "logs": [
+                            {
+                                "run_id": f"bench-{i}-{j}",
+                                "context": {"status": "success", "index": j},
+                            }
+                            for j in range(logs)
+                        ],
+                    },
+                )
+
+            async def listing(_: int):
+                return await client.get(
+                    "/api/v1/workflow/", params={"limit": 100}
+                )
+
+            async def search(i: int):
+                return await client.get(
+                    "/workflow/search",
+                    params={"search_text": f"bench-{i % 10}"},
+                    cookies=cookies,
+                )
+
+            async def page(_: int):
+                return await client.get("/workflow/", cookies=cookies)
+
+            async def login(_: int):
+                return await client.post(
+                    "/auth/login", data=login_data, follow_redirects=False
+                )
+
+            funcs: dict[str, Callable[[int], Awaitable[Any]]] = {
+                "ingest": ingest,
+                "list": listing,
+                "search": search,
+                "page": page,
+                "login": login,
+            }
+            for name in scenarios:
+                results[name] = await load(
+                    funcs[name],
+                    (
+                        max(requests // LOGIN_RATIO, concurrency)
+                        if name == "login"
+                        else requests
+                    ),
+                    concurrency,
+                )
+    return results
+
+
+def metadata(args: argparse.Namespace) -> dict[str, Any]:
+    try:
+        commit: str = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "workflows": args.workflows,
+        "logs": args.logs,
+    }
+
+
+def report(results: dict[str, dict], baseline: dict[str, dict] | None) -> None:
+    print(
+        f"{'scenario':>8} | {'requests':>8} | {'errors':>6} | {'req/sec':>9} | "
+        f"{'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'max ms':>8}"
+        + (f" | {'rps diff':>8} | {'p99 diff':>8}" if baseline else "")
+    )
+    for name, rs in results.items():
+        line: str = (
+            f"{name:>8} | {rs['requests']:>8} | {rs['errors']:>6} | "
+            f"{rs['rps']:>9,.1f} | {rs['p50_ms']:>8.2f} | "
+            f"{rs['p95_ms']:>8.2f} | {rs['p99_ms']:>8.2f} | "
+            f"{rs['max_ms']:>8.2f}"
+        )
+        if baseline and (base := baseline.get(name)):
+            line += (
+                f" | {(rs['rps'] / base['rps'] - 1) * 100:>+7.1f}%"
+                f" | {(rs['p99_ms'] / base['p99_ms'] - 1) * 100:>+7.1f}%"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--workflows", type=int, default=200)
+    parser.add_argument("--logs", type=int, default=10)
+    parser.add_argument(
+        "--save", metavar="NAME", help="Save the result as a baseline name."
+    )
+    parser.add_argument(
+        "--compare", metavar="NAME", help="Compare with a baseline name."
+    )
+    args = parser.parse_args()
+
+    baseline: dict[str, dict] | None = None
+    if args.compare:
+        baseline = json.loads((BASELINES / f"{args.compare}.json").read_text())[
+            "results"
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["OBSERVE_SQLALCHEMY_DB_ASYNC_URL"] = (
+            f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        )
+        results = asyncio.run(
+            main(
+                args.scenarios,
+                args.requests,
+                args.concurrency,
+                args.workflows,
+                args.logs,
+            )
+        )
+
+    report(results, baseline)
+    if args.save:
+        BASELINES.mkdir(exist_ok=True)
+        path: Path = BASELINES / f"{args.save}.json"
+        path.write_text(
+            json.dumps(
+                {"metadata": metadata(args), "results": results}, indent=2
+            )
+            + "\n"
+        )
+        print(f"Save the baseline to {path}")
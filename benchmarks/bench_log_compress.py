@@ -0,0 +1,118 @@
+"""
+Benchmark the storage size and the read latency of the workflow log context
+between the plain JSON column and the compressed JSON column with and without
+the shared dictionary.
+
+    (env) $ python ./benchmarks/bench_log_compress.py --size 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from ddeutil.observe.db import CompressedJSON
+from ddeutil.observe.routes.workflow.models import WORKFLOW_LOG_ZDICT
+from sqlalchemy import (
+    JSON,
+    Column,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+def make_context(i: int) -> dict[str, Any]:
+    run_id: str = f"{random.randrange(10**10):010d}20240902093554{i:06d}"
+    return {
+        "name": f"wf-scheduling-{i % 20}",
+        "on": "*/3 * * * *",
+        "release": "2024-09-02 09:36:00+07:00",
+        "context": {
+            "params": {"asat-dt": "2024-09-02 09:36:00+07:00"},
+            "jobs": {
+                f"job-{j}": {
+                    "matrix": {},
+                    "stages": {
+                        f"{random.randrange(10**10):010d}": {"outputs": {}}
+                        for _ in range(3)
+                    },
+                }
+                for j in range(i % 3 + 1)
+            },
+        },
+        "parent_run_id": run_id,
+        "run_id": run_id,
+        "update": f"2024-09-02 09:35:54.{i:06d}",
+    }
+
+
+async def run(name: str, column_type, contexts: list[dict]) -> None:
+    metadata = MetaData()
+    table = Table(
+        "workflow_logs",
+        metadata,
+        Column("run_id", String, primary_key=True),
+        Column("context", column_type),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path: Path = Path(tmp) / "bench.db"
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            start: float = time.perf_counter()
+            await conn.execute(
+                insert(table),
+                [
+                    {"run_id": str(i), "context": c}
+                    for i, c in enumerate(contexts)
+                ],
+            )
+            write: float = time.perf_counter() - start
+
+        async with engine.connect() as conn:
+            size: int = await conn.scalar(
+                select(func.sum(func.length(table.c.context)))
+            )
+            start: float = time.perf_counter()
+            rows = (await conn.execute(select(table.c.context))).scalars().all()
+            read: float = time.perf_counter() - start
+            assert rows == contexts
+        await engine.dispose()
+        file_size: int = path.stat().st_size
+
+    print(
+        f"{name:>16} | {size / len(contexts):>10.1f} | {file_size:>12,} | "
+        f"{write:>9.4f} | {read:>9.4f} | {read / len(contexts) * 1e6:>10.2f}"
+    )
+
+
+async def main(size: int) -> None:
+    random.seed(0)
+    contexts: list[dict] = [make_context(i) for i in range(size)]
+    print(
+        f"{'type':>16} | {'bytes/log':>10} | {'file bytes':>12} | "
+        f"{'write sec':>9} | {'read sec':>9} | {'read us/log':>10}"
+    )
+    for name, column_type in (
+        ("json", JSON),
+        ("zlib", CompressedJSON()),
+        ("zlib+zdict", CompressedJSON(zdict=WORKFLOW_LOG_ZDICT)),
+    ):
+        await run(name, column_type, contexts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.size))
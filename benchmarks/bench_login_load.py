@@ -0,0 +1,108 @@
+"""
+Load test the latency of the health API while many logins are in flight. The
+password hashing runs on the bounded thread pool by default, and the inline
+mode runs it on the event loop like the previous implementation.
+
+    (env) $ python ./benchmarks/bench_login_load.py --logins 50
+    (env) $ python ./benchmarks/bench_login_load.py --logins 50 --inline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+async def main(logins: int, inline: bool) -> None:
+    from ddeutil.observe.app import app
+    from ddeutil.observe.auth import securities
+    from ddeutil.observe.conf import config
+    from ddeutil.observe.utils import get_logger
+    from httpx import ASGITransport, AsyncClient
+
+    get_logger("ddeutil.observe").setLevel("WARNING")
+
+    if inline:
+
+        async def run_inline(func, *args):
+            return func(*args)
+
+        securities.hash_pool.run = run_inline
+
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            async def health(stop: asyncio.Event) -> list[float]:
+                latencies: list[float] = []
+                while not stop.is_set():
+                    start: float = time.perf_counter()
+                    response = await client.get("/api/v1/")
+                    latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200
+                    await asyncio.sleep(0.005)
+                return latencies
+
+            async def login(i: int) -> int:
+                response = await client.post(
+                    "/api/v1/auth/token",
+                    data={
+                        "username": config.WEB_ADMIN_USER,
+                        "password": config.WEB_ADMIN_PASS,
+                        "grant_type": "password",
+                        "scope": f"me login-{i}",
+                    },
+                )
+                return response.status_code
+
+            stop = asyncio.Event()
+            baseline_task = asyncio.create_task(health(stop))
+            await asyncio.sleep(1)
+            stop.set()
+            baseline: list[float] = await baseline_task
+
+            stop = asyncio.Event()
+            load_task = asyncio.create_task(health(stop))
+            start: float = time.perf_counter()
+            codes = await asyncio.gather(*(login(i) for i in range(logins)))
+            elapsed: float = time.perf_counter() - start
+            stop.set()
+            load: list[float] = await load_task
+
+    print(f"mode: {'inline' if inline else 'pool'}, logins: {logins}")
+    print(f"logins finished in {elapsed:.3f} sec, status: {set(codes)}")
+    print(f"{'phase':>9} | {'count':>6} | {'p50 ms':>9} | {'p99 ms':>9}")
+    for name, values in (("baseline", baseline), ("load", load)):
+        print(
+            f"{name:>9} | {len(values):>6} | "
+            f"{statistics.median(values) * 1000:>9.2f} | "
+            f"{percentile(values, 0.99) * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument(
+        "--inline",
+        action="store_true",
+        help="Run the password hashing on the event loop.",
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["OBSERVE_SQLALCHEMY_DB_ASYNC_URL"] = (
+            f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        )
+        asyncio.run(main(args.logins, args.inline))
@@ -0,0 +1,113 @@
+"""
+Benchmark the requests per second of the full middleware stack on the health
+check endpoint, ``GET /api/v1/``, between the application without any
+middleware, the application with the pure ASGI middlewares, and the legacy
+stack that has the process time middleware on ``BaseHTTPMiddleware``.
+
+    (env) $ python ./benchmarks/bench_middleware.py --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from ddeutil.observe.app import app
+from ddeutil.observe.metrics import route_metrics, route_name
+from ddeutil.observe.middleware import ProcessTimeMiddleware
+from ddeutil.observe.profiler import count_queries, request_scope
+from fastapi import FastAPI, Request
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+
+async def legacy_process_time(request: Request, call_next):
+    """The previous process time middleware that use the decorator."""
+    route_metrics.in_flight += 1
+    request_scope.set(request.scope)
+    status_code: int = 500
+    start_time = time.perf_counter()
+    with count_queries() as queries:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            process_time = time.perf_counter() - start_time
+            route_metrics.in_flight -= 1
+            route_metrics.observe(
+                request.method,
+                route_name(request.scope),
+                status_code,
+                process_time,
+            )
+    response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-DB-Queries"] = str(queries.queries)
+    response.headers["X-DB-Time"] = str(queries.seconds)
+    return response
+
+
+def make_app(middleware: list[Middleware]) -> FastAPI:
+    """Return the application that share the routes and the exception
+    handlers of the observe application with a different middleware stack.
+    """
+    other = FastAPI()
+    other.router = app.router
+    other.exception_handlers = app.exception_handlers
+    other.user_middleware = middleware
+    return other
+
+
+async def run(target: FastAPI, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        # NOTE: Warm up the middleware stack before measuring.
+        for _ in range(50):
+            assert (await client.get("/api/v1/")).status_code == 200
+
+        async def worker(n: int) -> None:
+            for _ in range(n):
+                await client.get("/api/v1/")
+
+        start: float = time.perf_counter()
+        await asyncio.gather(
+            *(worker(requests // concurrency) for _ in range(concurrency))
+        )
+        return (requests // concurrency * concurrency) / (
+            time.perf_counter() - start
+        )
+
+
+async def main(requests: int, concurrency: int, rounds: int) -> None:
+    stacks: dict[str, FastAPI] = {
+        "bare": make_app([]),
+        "asgi": app,
+        "legacy": make_app(
+            [
+                (
+                    Middleware(BaseHTTPMiddleware, dispatch=legacy_process_time)
+                    if m.cls is ProcessTimeMiddleware
+                    else m
+                )
+                for m in app.user_middleware
+            ]
+        ),
+    }
+    print(f"{'stack':>8} | {'req/sec':>9} | {'us/req':>8}")
+    for name, target in stacks.items():
+        best: float = max(
+            [await run(target, requests, concurrency) for _ in range(rounds)]
+        )
+        print(f"{name:>8} | {best:>9,.0f} | {1_000_000 / best:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.rounds))
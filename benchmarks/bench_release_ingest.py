@@ -0,0 +1,134 @@
+"""
+Benchmark the release log ingestion between the legacy implementation that
+commit every log row and the bulk implementation that write a release and all
+of its logs in one transaction.
+
+    (env) $ python ./benchmarks/bench_release_ingest.py --sizes 10 1000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from ddeutil.observe.routes.workflow import models as md
+from ddeutil.observe.routes.workflow.crud import create_release_log
+from ddeutil.observe.routes.workflow.schemas import ReleaseLogCreate
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+
+async def legacy_create_release_log(
+    session: AsyncSession,
+    workflow_id: int,
+    release_log: ReleaseLogCreate,
+) -> md.WorkflowReleases:
+    """The previous implementation that flush, commit, and refresh for every
+    log row.
+    """
+    db_release = md.WorkflowReleases(
+        release=release_log.release,
+        workflow_id=workflow_id,
+    )
+    session.add(db_release)
+    await session.flush()
+    await session.commit()
+    await session.refresh(db_release)
+
+    for log in release_log.logs:
+        db_log = md.WorkflowLogs(
+            run_id=log.run_id,
+            context=log.context,
+            release_id=db_release.id,
+        )
+        session.add(db_log)
+        await session.flush()
+        await session.commit()
+        await session.refresh(db_log)
+    return db_release
+
+
+def make_release(release: int, size: int) -> ReleaseLogCreate:
+    return ReleaseLogCreate(
+        release=release,
+        logs=[
+            {
+                "run_id": f"{release}{i:010d}",
+                "context": {
+                    "name": "wf-benchmark",
+                    "on": "*/3 * * * *",
+                    "context": {
+                        "params": {"asat-dt": "2024-09-02 09:36:00+07:00"},
+                        "jobs": {"some-job": {"matrix": {}, "stages": {}}},
+                    },
+                },
+            }
+            for i in range(size)
+        ],
+    )
+
+
+async def run(func, size: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(md.Base.metadata.create_all)
+
+        maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+        data: ReleaseLogCreate = make_release(20240902093600, size)
+        async with maker() as session:
+            session.add(
+                md.Workflows(name="wf-benchmark", params={}, on=[], jobs={})
+            )
+            await session.commit()
+
+            start: float = time.perf_counter()
+            await func(session, 1, data)
+            elapsed: float = time.perf_counter() - start
+
+        await engine.dispose()
+    return elapsed
+
+
+async def main(sizes: list[int], legacy_max: int) -> None:
+    print(f"{'logs':>8} | {'impl':>6} | {'seconds':>9} | {'rows/sec':>12}")
+    for size in sizes:
+        for name, func in (
+            ("bulk", create_release_log),
+            ("legacy", legacy_create_release_log),
+        ):
+            if name == "legacy" and size > legacy_max:
+                print(f"{size:>8} | {name:>6} | {'skipped':>9} | {'-':>12}")
+                continue
+            elapsed: float = await run(func, size)
+            print(
+                f"{size:>8} | {name:>6} | {elapsed:>9.4f} | "
+                f"{size / elapsed:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10, 1_000, 100_000]
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=10_000,
+        help=(
+            "Skip the legacy implementation for sizes larger than this value "
+            "because it take several minutes for 100k logs."
+        ),
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.legacy_max))
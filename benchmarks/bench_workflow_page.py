@@ -0,0 +1,98 @@
+"""
+Benchmark the render latency of the workflow page between the legacy
+templates dependency that build the Jinja2 environment on every request, and
+the current dependency that use the environment from the registry.
+
+    (env) $ python ./benchmarks/bench_workflow_page.py --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import warnings
+from pathlib import Path
+
+import ddeutil.observe.deps as deps
+from ddeutil.observe.app import app
+from ddeutil.observe.conf import config
+from fastapi import Request
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+from jinja2 import ChoiceLoader, FileSystemLoader
+
+
+def legacy_get_templates(request: Request) -> Jinja2Templates:
+    """The previous dependency that build a new environment on every request."""
+    choices: list[FileSystemLoader] = [FileSystemLoader("./templates")]
+    if request.url.path != "/":
+        route: str = request.url.path.strip("/").split("/")[0]
+        route_path: Path = (
+            Path(deps.__file__).parent / f"routes/{route}/templates"
+        )
+        if route_path.exists():
+            choices.insert(0, FileSystemLoader(route_path))
+        else:
+            auth_path: Path = Path(deps.__file__).parent / "auth/templates"
+            if auth_path.exists():
+                choices.insert(0, FileSystemLoader(auth_path))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return Jinja2Templates(
+            directory="templates",
+            loader=ChoiceLoader(choices),
+        )
+
+
+def measure(client: TestClient, path: str, requests: int) -> list[float]:
+    latencies: list[float] = []
+    for _ in range(requests):
+        start: float = time.perf_counter()
+        response = client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+    return latencies
+
+
+def main(requests: int) -> None:
+    with TestClient(app) as client:
+        response = client.post(
+            "/auth/login",
+            data={
+                "username": config.WEB_ADMIN_USER,
+                "password": config.WEB_ADMIN_PASS,
+                "grant_type": "password",
+            },
+            follow_redirects=False,
+        )
+        token: str = response.cookies["refresh_token"].strip('"').split()[-1]
+        client.cookies.clear()
+        client.cookies.set("refresh_token", f"Bearer {token}")
+
+        print(f"{'impl':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'mean ms':>8}")
+        for name, dependency in (
+            ("legacy", legacy_get_templates),
+            ("registry", None),
+        ):
+            if dependency is not None:
+                app.dependency_overrides[deps.get_templates] = dependency
+            else:
+                app.dependency_overrides.clear()
+
+            # NOTE: Warm up the application before measuring.
+            measure(client, "/workflow/", 10)
+            latencies: list[float] = measure(client, "/workflow/", requests)
+            q = statistics.quantiles(latencies, n=100)
+            print(
+                f"{name:>8} | {q[49]:>8.3f} | {q[94]:>8.3f} | "
+                f"{statistics.mean(latencies):>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    main(args.requests)
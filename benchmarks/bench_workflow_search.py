@@ -0,0 +1,107 @@
+"""
+Benchmark the workflow search between the legacy implementation that load the
+first 1,000 workflows and match the search text in Python, and the current
+implementation that search with the full-text search index (or the LIKE
+fallback) on the database.
+
+    (env) $ python ./benchmarks/bench_workflow_search.py --size 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from ddeutil.observe.routes.workflow import models as md
+from ddeutil.observe.routes.workflow.crud import list_workflows, search_workflow
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+SEARCH_TEXTS: tuple[str, ...] = ("batch-job-0099", "scheduling", "wf", "zzz")
+
+
+async def legacy_search_workflow(
+    session: AsyncSession,
+    search_text: str,
+) -> list[md.Workflows]:
+    """The previous implementation that filter the first 1,000 workflows in
+    Python.
+    """
+    search_text = search_text.strip().lower()
+    results = []
+    for workflow in await list_workflows(session=session):
+        text: str = f"{workflow.name} {workflow.desc or ''}".lower()
+        if search_text in text:
+            results.append(workflow)
+    return results
+
+
+async def timeit(func, session: AsyncSession, text: str, rounds: int):
+    latencies: list[float] = []
+    count: int = 0
+    for _ in range(rounds):
+        start: float = time.perf_counter()
+        count = len(await func(session, text))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), max(latencies), count
+
+
+async def main(size: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(md.Base.metadata.create_all)
+            await conn.execute(
+                insert(md.Workflows),
+                [
+                    {
+                        "name": (
+                            f"wf-batch-job-{i:07d}"
+                            if i % 2
+                            else f"wf-scheduling-{i:07d}"
+                        ),
+                        "desc": f"Workflow number {i} of the benchmark",
+                        "params": {},
+                        "on": [],
+                        "jobs": {},
+                    }
+                    for i in range(size)
+                ],
+            )
+
+        maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+        print(
+            f"{'search':>16} | {'impl':>6} | {'p50 ms':>9} | {'max ms':>9} "
+            f"| {'rows':>6}"
+        )
+        async with maker() as session:
+            for text in SEARCH_TEXTS:
+                for name, func in (
+                    ("index", search_workflow),
+                    ("legacy", legacy_search_workflow),
+                ):
+                    p50, peak, count = await timeit(func, session, text, rounds)
+                    print(
+                        f"{text:>16} | {name:>6} | {p50:>9.3f} | {peak:>9.3f} "
+                        f"| {count:>6}"
+                    )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.size, args.rounds))
@@ -0,0 +1,129 @@
+"""
+Benchmark the concurrent release ingestion on SQLite between the direct
+transactions that compete for the write lock, and the single writer queue
+that runs the releases together in batched transactions.
+
+    (env) $ python ./benchmarks/bench_write_queue.py --clients 50 --releases 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+from ddeutil.observe.db import DBSessionManager
+from ddeutil.observe.routes.workflow import models as md
+from ddeutil.observe.routes.workflow.crud import add_release_log
+from ddeutil.observe.routes.workflow.schemas import ReleaseLogCreate
+from ddeutil.observe.writer import WriteQueue
+
+
+def make_release(release: int, size: int) -> ReleaseLogCreate:
+    return ReleaseLogCreate(
+        release=release,
+        logs=[
+            {
+                "run_id": f"{release}{i:04d}",
+                "context": {"name": "wf-benchmark", "status": "success"},
+            }
+            for i in range(size)
+        ],
+    )
+
+
+async def run(
+    mode: str,
+    clients: int,
+    releases: int,
+    logs: int,
+    batch_size: int,
+) -> tuple[list[float], float, int, dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DBSessionManager()
+        manager.init(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with manager.connect() as conn:
+            await conn.run_sync(md.Base.metadata.create_all)
+        async with manager.session() as session:
+            session.add(
+                md.Workflows(name="wf-benchmark", params={}, on=[], jobs={})
+            )
+            await session.commit()
+
+        queue = WriteQueue(manager=manager, batch_size=batch_size)
+        if mode == "queue":
+            queue.start()
+
+        latencies: list[float] = []
+        errors: list[Exception] = []
+
+        async def client(index: int) -> None:
+            for i in range(releases):
+                op = partial(
+                    add_release_log,
+                    workflow_id=1,
+                    release_log=make_release(index * 100_000 + i, logs),
+                )
+                start: float = time.perf_counter()
+                try:
+                    if mode == "queue":
+                        await queue.submit(op)
+                    else:
+                        async with manager.session() as session:
+                            await op(session)
+                            await session.commit()
+                except Exception as err:
+                    errors.append(err)
+                latencies.append(time.perf_counter() - start)
+
+        start: float = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(clients)))
+        elapsed: float = time.perf_counter() - start
+
+        await queue.stop()
+        await manager.close()
+    return latencies, elapsed, len(errors), queue.stats()
+
+
+async def main(
+    clients: int,
+    releases: int,
+    logs: int,
+    batch_size: int,
+) -> None:
+    print(
+        f"{'mode':>6} | {'releases':>8} | {'rel/sec':>8} | {'p50 ms':>8} | "
+        f"{'p99 ms':>8} | {'max ms':>8} | {'errors':>6} | {'batch':>6}"
+    )
+    for mode in ("direct", "queue"):
+        latencies, elapsed, errors, stats = await run(
+            mode, clients, releases, logs, batch_size
+        )
+        latencies.sort()
+        p99: float = latencies[int(len(latencies) * 0.99) - 1]
+        batch: str = (
+            f"{stats['batch_size']['sum'] / stats['batches']:.1f}"
+            if stats["batches"]
+            else "-"
+        )
+        print(
+            f"{mode:>6} | {len(latencies):>8} | "
+            f"{len(latencies) / elapsed:>8,.0f} | "
+            f"{statistics.median(latencies) * 1000:>8.1f} | "
+            f"{p99 * 1000:>8.1f} | {latencies[-1] * 1000:>8.1f} | "
+            f"{errors:>6} | {batch:>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--releases", type=int, default=20)
+    parser.add_argument("--logs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.releases, args.logs, args.batch_size))
@@ -5,7 +5,7 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
-import time
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI, Request
@@ -18,18 +18,28 @@ from sqlalchemy.exc import OperationalError
 
 from .__about__ import __version__
 from .auth import api_auth, auth
+from .auth.securities import hash_pool
+from .auth.sweeper import sweep_forever
 from .backend import OAuth2Backend, OAuth2Middleware
 from .conf import config
 from .db import sessionmanager
-from .deps import get_templates
+from .deps import get_templates, init_templates
+from .middleware import ProcessTimeMiddleware
+from .ratelimit import RateLimitMiddleware, limiter
 from .routes import api_router, workflow
+from .routes.workflow.retention import retention_forever
 from .utils import get_logger
+from .writer import writer
 
 logger = get_logger("ddeutil.observe")
 
 # NOTE: Initial sqlalchemy session maker object that create instance of current
-#   database pointer from `OBSERVE_SQLALCHEMY_DB_ASYNC_URL` env var.
-sessionmanager.init(config.OBSERVE_SQLALCHEMY_DB_ASYNC_URL)
+#   database pointer from `OBSERVE_SQLALCHEMY_DB_ASYNC_URL` env var, and the
+#   optional read-only one from `OBSERVE_SQLALCHEMY_DB_ASYNC_READ_URL`.
+sessionmanager.init(
+    config.OBSERVE_SQLALCHEMY_DB_ASYNC_URL,
+    config.OBSERVE_SQLALCHEMY_DB_ASYNC_READ_URL,
+)
 
 
 @asynccontextmanager
@@ -37,17 +47,58 @@ async def lifespan(_: FastAPI):
     """Lifespan context function that make sure the session maker instance
     already close after respond the incoming request to the client.
     """
+    # NOTE: Re-initialize the session maker if it was closed by the previous
+    #   lifespan such as running the application with the test client again.
+    if not sessionmanager.is_opened():
+        sessionmanager.init(
+            config.OBSERVE_SQLALCHEMY_DB_ASYNC_URL,
+            config.OBSERVE_SQLALCHEMY_DB_ASYNC_READ_URL,
+        )
+
     async with sessionmanager.connect() as conn:
         await sessionmanager.create_all(conn)
 
+    # NOTE: Build the Jinja2 environment of every route prefix once.
+    init_templates()
+
     from .init import create_admin
 
     async with sessionmanager.session() as session:
         await create_admin(session)
 
+        # NOTE: Load the rate limit rules once, so the rate limit middleware
+        #   does not query them on every request.
+        await limiter.load(session, config.RATELIMIT_TIER)
+
+    tasks: list[asyncio.Task] = []
+    if config.WORKFLOW_RETENTION_INTERVAL > 0 and (
+        config.WORKFLOW_RETENTION_KEEP_RELEASES > 0
+        or config.WORKFLOW_RETENTION_KEEP_DAYS > 0
+    ):
+        tasks.append(
+            asyncio.create_task(
+                retention_forever(config.WORKFLOW_RETENTION_INTERVAL)
+            )
+        )
+
+    if config.AUTH_TOKEN_SWEEP_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(sweep_forever(config.AUTH_TOKEN_SWEEP_INTERVAL))
+        )
+
+    if config.DB_WRITE_QUEUE:
+        writer.start()
+
     # NOTE: Start release application.
     yield
 
+    await writer.stop()
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    hash_pool.shutdown()
+
     if sessionmanager.is_opened():
         await sessionmanager.close()
 
@@ -67,18 +118,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# NOTE: Add oauth2 backend middleware.
-app.add_middleware(OAuth2Middleware, backend=OAuth2Backend())
+# NOTE: Add the rate limit middleware before the oauth2 backend middleware, so
+#   it runs after the authentication and can count the requests of each user.
+app.add_middleware(RateLimitMiddleware, limiter=limiter)
 
+# NOTE: Add oauth2 backend middleware.
+app.add_middleware(
+    OAuth2Middleware,
+    backend=OAuth2Backend(),
+    skip_paths=config.AUTH_SKIP_PATHS,
+)
 
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Custom process time middleware."""
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    process_time = time.perf_counter() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# NOTE: Add the process time middleware at the last, so it is the outermost
+#   middleware and its time include the authentication and the rate limit.
+#   All middlewares are the plain ASGI applications that do not wrap the
+#   request and the response like the ``@app.middleware("http")`` decorator.
+app.add_middleware(ProcessTimeMiddleware)
 
 
 @app.exception_handler(OperationalError)
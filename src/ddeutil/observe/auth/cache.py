@@ -0,0 +1,54 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..cache import TTLCache
+from ..conf import config
+from .models import User
+from .schemas import TokenDataSchema
+
+# NOTE: Map a token digest to its revoked state. The `False` value will keep
+#   with the default TTL and the `True` value will keep until the refresh
+#   token expire.
+revoked_tokens: TTLCache[bytes, bool] = TTLCache(
+    maxsize=config.AUTH_TOKEN_CACHE_MAXSIZE,
+    ttl=config.AUTH_TOKEN_CACHE_TTL,
+)
+
+# NOTE: Map a token type and its digest to the decoded claims of the token that
+#   its signature was valid, so the repeat verification does not decode the
+#   token again. Each item keeps until its token expire.
+token_claims: TTLCache[tuple[str, bytes], TokenDataSchema] = TTLCache(
+    maxsize=config.AUTH_TOKEN_CLAIMS_CACHE_MAXSIZE,
+    ttl=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+# NOTE: Map a username to the detached copy of its user row. A process that
+#   changes the password, deactivates, or deletes the user will drop it from
+#   its cache, but the other processes can see the stale user until its TTL.
+user_cache: TTLCache[str, User] = TTLCache(
+    maxsize=config.AUTH_USER_CACHE_MAXSIZE,
+    ttl=config.AUTH_USER_CACHE_TTL,
+)
+
+
+def cache_user(user: User) -> None:
+    """Keep the detached copy of a user on the user cache, so the change on
+    the user instance of any session does not change the cached value.
+    """
+    if user_cache.maxsize <= 0 or user_cache.ttl <= 0:
+        return
+    copied = User(
+        **{
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(User).column_attrs
+        }
+    )
+    make_transient_to_detached(copied)
+    user_cache.set(user.username, copied)
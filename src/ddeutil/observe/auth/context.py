@@ -0,0 +1,93 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
+
+from .cache import cache_user, user_cache
+from .crud import verify_access_token, verify_refresh_token
+from .models import User
+from .schemas import TokenDataSchema
+
+
+class AuthContext:
+    """Request-scoped authentication context that keeps the verified tokens
+    and the loaded users of one request, so the authentication middleware and
+    the dependencies do not verify the same token or query the same user
+    again.
+
+    The user that was loaded on another session, such as the middleware
+    session or the user cache, will merge to the session of the caller without
+    any query.
+    """
+
+    def __init__(self) -> None:
+        self.tokens: dict[tuple[str, str], Optional[TokenDataSchema]] = {}
+        self.users: dict[str, Optional[User]] = {}
+
+    async def verify_refresh_token(
+        self,
+        token: Optional[str],
+        session: AsyncSession,
+    ) -> Optional[TokenDataSchema]:
+        """Verify a refresh token only once per request."""
+        if not token:
+            return None
+        if (key := ("refresh", token)) not in self.tokens:
+            self.tokens[key] = await verify_refresh_token(
+                token, session, users=self.users
+            )
+        return self.tokens[key]
+
+    async def verify_access_token(
+        self,
+        token: Optional[str],
+        session: AsyncSession,
+    ) -> Optional[TokenDataSchema]:
+        """Verify an access token only once per request."""
+        if not token:
+            return None
+        if (key := ("access", token)) not in self.tokens:
+            self.tokens[key] = await verify_access_token(
+                token, session, users=self.users
+            )
+        return self.tokens[key]
+
+    async def get_user(
+        self,
+        username: str,
+        session: AsyncSession,
+    ) -> Optional[User]:
+        """Get a user by its username only once per request, and attach it to
+        the session of the caller. It gets from the user cache before querying
+        the users table.
+        """
+        if username in self.users:
+            user: Optional[User] = self.users[username]
+            if user is not None and username not in user_cache:
+                cache_user(user)
+        elif (user := user_cache.get(username)) is None:
+            user = await User.get_by_username(session, username=username)
+            if user is not None:
+                cache_user(user)
+
+        if user is not None and user not in session:
+            user = await session.merge(user, load=False)
+        self.users[username] = user
+        return user
+
+
+def get_auth_context(conn: HTTPConnection) -> AuthContext:
+    """Get the authentication context of the current request from its state.
+    It creates the new one if the authentication middleware does not set it.
+    """
+    state: dict = conn.scope.setdefault("state", {})
+    if (context := state.get("auth_context")) is None:
+        context = state["auth_context"] = AuthContext()
+    return context
@@ -5,19 +5,23 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import time
 from datetime import datetime, timedelta
-from typing import Any, Union
+from functools import partial
+from typing import Any, Callable, Union
 
 import jwt
 from fastapi import HTTPException
 from fastapi import status as st
 from pydantic import ValidationError
-from sqlalchemy import delete, update
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import false
+from sqlalchemy.sql import false, true
 
 from ..conf import config
 from ..crud import BaseCRUD
+from ..writer import write
+from .cache import revoked_tokens, token_claims, user_cache
 from .models import Token, User
 from .schemas import (
     TokenCreate,
@@ -30,6 +34,8 @@ from .securities import (
     decode_access_token,
     decode_refresh_token,
     get_password_hash,
+    hash_pool,
+    token_digest,
     verify_password,
 )
 
@@ -40,49 +46,67 @@ async def authenticate(
     password: str,
 ) -> Union[User, bool]:
     if user := await User.get_by_username(session, username=name):
-        return (
-            user if verify_password(password, user.hashed_password) else False
-        )
+        if await hash_pool.run(verify_password, password, user.hashed_password):
+            return user
+        return False
     return False
 
 
 class TokenCRUD(BaseCRUD):
 
-    async def retention_by_user(self, user_id: str):
-        db_tokens: list[Token] = await Token.get_active_by_user(
-            self.async_session, user_id
+    async def retention_by_user(self, user_id: str) -> None:
+        """Delete the active tokens of a user that were created two days ago
+        or more. It runs on the writer queue if that queue is running.
+        """
+        await write(
+            self.async_session, partial(self.delete_by_user, user_id=user_id)
         )
-        info: list[str] = []
-        for record in db_tokens:
-            if (datetime.now() - record.created_at).days > 1:
-                info.append(record.id)
-
-        if info:
-            await self.async_session.execute(
-                delete(Token).where(Token.id.in_(info))
+
+    @staticmethod
+    async def delete_by_user(session: AsyncSession, user_id: str) -> None:
+        """Delete the active tokens of a user that were created two days ago
+        or more on the current transaction without committing it.
+        """
+        await session.execute(
+            delete(Token)
+            .where(
+                Token.user_id == user_id,
+                Token.is_active == true(),
+                Token.created_at <= datetime.now() - timedelta(days=2),
             )
-            await self.async_session.flush()
-            await self.async_session.commit()
+            .execution_options(synchronize_session=False)
+        )
 
     async def update_logout(self, token: str):
-        db_tokens = await Token.get(self.async_session, token=token)
-        if db_tokens:
-            rs = await self.async_session.execute(
-                update(Token)
-                .where(Token.token == token)
-                .values(is_active=false())
-                .returning(Token)
-            )
-            await self.async_session.flush()
-            await self.async_session.commit()
-            return rs.scalars().all()
-        return []
+        db_tokens: list[Token] = await write(
+            self.async_session, partial(self.disable, token=token)
+        )
+        revoke_token_cache(token)
+        return db_tokens
+
+    @staticmethod
+    async def disable(session: AsyncSession, token: str) -> list[Token]:
+        """Disable a token on the current transaction without committing it."""
+        rs = await session.execute(
+            update(Token)
+            .where(Token.digest == token_digest(token))
+            .values(is_active=false())
+            .returning(Token)
+        )
+        return rs.scalars().all()
 
     async def create(self, token: TokenCreate) -> Token:
         """Create token"""
+        return await write(self.async_session, partial(self.add, token=token))
+
+    @staticmethod
+    async def add(session: AsyncSession, token: TokenCreate) -> Token:
+        """Add the access and refresh tokens to the current transaction
+        without committing it, and return the access token.
+        """
         db_token = Token(
             user_id=token.user_id,
-            token=token.access_token,
+            digest=token_digest(token.access_token),
             is_active=token.is_active,
             expires_at=(
                 datetime.now()
@@ -91,17 +115,16 @@ class TokenCRUD(BaseCRUD):
         )
         db_refresh = Token(
             user_id=token.user_id,
-            token=token.refresh_token,
+            digest=token_digest(token.refresh_token),
             is_active=token.is_active,
             expires_at=(
                 datetime.now()
                 + timedelta(minutes=config.REFRESH_TOKEN_EXPIRE_MINUTES)
             ),
         )
-        self.async_session.add_all([db_token, db_refresh])
-        await self.async_session.flush()
-        await self.async_session.commit()
-        await self.async_session.refresh(db_token)
+        session.add_all([db_token, db_refresh])
+        await session.flush()
+        await session.refresh(db_token)
         return db_token
 
 
@@ -113,27 +136,57 @@ class UserCRUD(BaseCRUD):
             name=user.username,
             password=user.old_password,
         )
-        if db_user is None:
+        if not db_user:
             raise HTTPException(
                 status_code=st.HTTP_400_BAD_REQUEST,
                 detail="User not found with old password",
             )
 
-        encrypted_password = get_password_hash(user.new_password)
-        db_user.password = encrypted_password
+        encrypted_password = await hash_pool.run(
+            get_password_hash, user.new_password
+        )
+        db_user.hashed_password = encrypted_password
         await self.async_session.flush()
         await self.async_session.commit()
         await self.async_session.refresh(db_user)
+        user_cache.pop(db_user.username)
+
+        return UserSchema.model_validate(db_user)
 
+    async def deactivate(self, username: str) -> UserSchema:
+        """Deactivate a user and drop it from the user cache."""
+        if not (
+            db_user := await User.get_by_username(self.async_session, username)
+        ):
+            raise HTTPException(status_code=st.HTTP_404_NOT_FOUND)
+
+        db_user.is_active = False
+        await self.async_session.flush()
+        await self.async_session.commit()
+        await self.async_session.refresh(db_user)
+        user_cache.pop(username)
         return UserSchema.model_validate(db_user)
 
+    async def delete(self, username: str) -> None:
+        """Delete a user with its tokens and drop it from the user cache."""
+        if not (
+            db_user := await User.get_by_username(
+                self.async_session, username, include_tokens=True
+            )
+        ):
+            raise HTTPException(status_code=st.HTTP_404_NOT_FOUND)
+
+        await self.async_session.delete(db_user)
+        await self.async_session.commit()
+        user_cache.pop(username)
+
     async def create_by_form(self, user: UserCreateForm) -> UserSchema:
         # NOTE: Validate by username value. By default, this will validate
         # from database with unique constraint.
         if await User.get_by_username(self.async_session, user.username):
             raise HTTPException(status_code=st.HTTP_409_CONFLICT)
 
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await hash_pool.run(get_password_hash, user.password)
         db_user: User = User(
             email=user.email,
             username=user.username,
@@ -161,43 +214,112 @@ class UserCRUD(BaseCRUD):
         return UserSchema.model_validate(db_user)
 
 
-async def verify_refresh_token(
+def revoke_token_cache(token: str) -> None:
+    """Mark a token as revoked on the in-process revocation cache until the
+    refresh token expire.
+    """
+    key: bytes = token_digest(token)
+    revoked_tokens.set(key, True, ttl=config.REFRESH_TOKEN_EXPIRE_MINUTES * 60)
+    token_claims.pop(("access", key))
+    token_claims.pop(("refresh", key))
+
+
+async def is_token_revoked(
     token: str,
     session: AsyncSession,
-) -> TokenDataSchema | None:
-    """Verify a refresh token."""
+    users: dict[str, User | None] | None = None,
+) -> bool:
+    """Return True if a token was revoked. It checks on the in-process
+    revocation cache first and query the tokens table only if the token does
+    not exist on the cache.
 
-    # NOTE: check token is disable or not.
-    if await Token.get_disable(session, token=token):
-        return None
+    :param token: A token that want to check.
+    :param session: An async session that use to query the tokens table.
+    :param users: A mapping of username and user that will keep the owner of
+        this token if it was loaded together with the token state.
+    """
+    key: bytes = token_digest(token)
+    if (revoked := revoked_tokens.get(key)) is not None:
+        return revoked
 
-    try:
-        payload: dict[str, Any] = decode_refresh_token(token)
-        if username := payload.get("sub"):
-            return TokenDataSchema(
-                username=username,
-                scopes=payload.get("scopes", []),
-            )
-        return None
-    except (jwt.InvalidTokenError, ValidationError):
-        return None
+    # NOTE: Load the token state with its owner in one query, so the request
+    #   that use this token does not query the user again.
+    row = (
+        await session.execute(
+            select(Token.is_active, User)
+            .join(User, User.id == Token.user_id)
+            .where(Token.digest == key)
+        )
+    ).first()
+    revoked: bool = row is not None and row.is_active is False
+    if revoked:
+        revoke_token_cache(token)
+    else:
+        revoked_tokens.set(key, False)
 
+    if row is not None and users is not None:
+        users[row.User.username] = row.User
+    return revoked
 
-async def verify_access_token(
-    token: str,
+
+async def _verify_token(
+    token: str | None,
     session: AsyncSession,
+    kind: str,
+    decoder: Callable[[str], dict[str, Any]],
+    users: dict[str, User | None] | None = None,
 ) -> TokenDataSchema | None:
-    # NOTE: check token is disable or not.
-    if await Token.get_disable(session, token=token):
+    """Verify a token with its decoder function. The decoded claims of the
+    valid token keep on the in-process cache until the token expire, so the
+    repeat verification does not decode and check its signature again.
+    """
+    if not token:
         return None
 
-    try:
-        payload: dict[str, Any] = decode_access_token(token)
-        if username := payload.get("sub"):
-            return TokenDataSchema(
+    key: tuple[str, bytes] = (kind, token_digest(token))
+    if (token_data := token_claims.get(key)) is None:
+        try:
+            payload: dict[str, Any] = decoder(token)
+        except jwt.InvalidTokenError:
+            return None
+
+        if not (username := payload.get("sub")):
+            return None
+
+        try:
+            token_data = TokenDataSchema(
                 username=username,
                 scopes=payload.get("scopes", []),
             )
+        except ValidationError:
+            return None
+
+        if exp := payload.get("exp"):
+            token_claims.set(key, token_data, ttl=exp - time.time())
+
+    # NOTE: check token is disable or not after its signature was valid.
+    if await is_token_revoked(token, session, users=users):
         return None
-    except (jwt.InvalidTokenError, ValidationError):
-        return None
+    return token_data
+
+
+async def verify_refresh_token(
+    token: str | None,
+    session: AsyncSession,
+    users: dict[str, User | None] | None = None,
+) -> TokenDataSchema | None:
+    """Verify a refresh token."""
+    return await _verify_token(
+        token, session, "refresh", decode_refresh_token, users=users
+    )
+
+
+async def verify_access_token(
+    token: str | None,
+    session: AsyncSession,
+    users: dict[str, User | None] | None = None,
+) -> TokenDataSchema | None:
+    """Verify an access token."""
+    return await _verify_token(
+        token, session, "access", decode_access_token, users=users
+    )
@@ -7,18 +7,20 @@ from __future__ import annotations
 
 from typing import Optional, TypeVar
 
-from fastapi import Depends, HTTPException, Security
+from fastapi import Depends, HTTPException, Request, Security
 from fastapi import status as st
 from fastapi.security import SecurityScopes
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..deps import get_async_session
-from .crud import verify_access_token, verify_refresh_token
-from .models import Token, User
+from .context import get_auth_context
+from .crud import is_token_revoked
+from .models import User
 from .securities import OAuth2Schema, OAuth2SchemaView
 
 
 async def get_current_access_token(
+    request: Request,
     token: Optional[str] = Depends(OAuth2Schema),
     session: AsyncSession = Depends(get_async_session),
 ) -> Optional[str]:
@@ -26,7 +28,9 @@ async def get_current_access_token(
 
     # NOTE: Check the access token is active or not. It able to be inactive
     #   before its expire cause the logout action.
-    if await Token.get_disable(session, token):
+    if token and await is_token_revoked(
+        token, session, users=get_auth_context(request).users
+    ):
         raise HTTPException(
             status_code=st.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -36,6 +40,7 @@ async def get_current_access_token(
 
 
 async def get_current_user(
+    request: Request,
     security_scopes: SecurityScopes,
     token: str = Depends(get_current_access_token),
     session: AsyncSession = Depends(get_async_session),
@@ -51,14 +56,13 @@ async def get_current_user(
         detail="Token was expired",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    if (token_data := await verify_access_token(token, session)) is None:
+    context = get_auth_context(request)
+    if (
+        token_data := await context.verify_access_token(token, session)
+    ) is None:
         raise credentials_exception
 
-    if not (
-        user := await User.get_by_username(
-            session, username=token_data.username
-        )
-    ):
+    if not (user := await context.get_user(token_data.username, session)):
         raise credentials_exception
 
     for scope in security_scopes.scopes:
@@ -171,11 +175,15 @@ SessionUser = TypeVar("SessionUser", bound=BaseUser)
 
 
 async def get_session_user(
+    request: Request,
     token: str = Depends(OAuth2SchemaView),
     session: AsyncSession = Depends(get_async_session),
 ) -> SessionUser:
     # Note: If token does not valid, it will return anonymous user.
-    if (token_data := await verify_refresh_token(token, session)) is None:
+    context = get_auth_context(request)
+    if (
+        token_data := await context.verify_refresh_token(token, session)
+    ) is None:
         return AnonymousUser()
     return SimpleUser(username=token_data.username)
 
@@ -192,21 +200,21 @@ async def required_current_token(
 
 
 async def required_current_user(
+    request: Request,
     token: str = Depends(required_current_token),
     session: AsyncSession = Depends(get_async_session),
 ):
-    if (token_data := await verify_refresh_token(token, session)) is None:
+    context = get_auth_context(request)
+    if (
+        token_data := await context.verify_refresh_token(token, session)
+    ) is None:
         raise HTTPException(
             status_code=st.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"Location": "/auth/login"},
         )
 
-    if not (
-        user := await User.get_by_username(
-            session, username=token_data.username
-        )
-    ):
+    if not (user := await context.get_user(token_data.username, session)):
         raise HTTPException(
             status_code=st.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -1,3 +1,3 @@
-from .ratelimit import Tier
+from .ratelimit import RateLimit, Tier
 from .token import Token
 from .user import User
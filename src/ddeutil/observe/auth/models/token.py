@@ -8,14 +8,33 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, text
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    MetaData,
+    Table,
+    event,
+    insert,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import false, select, true
-from sqlalchemy.types import UUID, Boolean, DateTime, Integer, String
+from sqlalchemy.types import (
+    UUID,
+    Boolean,
+    DateTime,
+    Integer,
+    LargeBinary,
+    String,
+)
 from typing_extensions import Self
 
 from ...db import Base, Col, Dtype
+from ..securities import token_digest
 
 if TYPE_CHECKING:
     from .user import User
@@ -23,13 +42,18 @@ if TYPE_CHECKING:
 
 class Token(Base):
     __tablename__ = "tokens"
+    __table_args__ = (
+        # NOTE: The expired token sweeper deletes with this index.
+        Index("tokens_expires_at_idx", "expires_at"),
+    )
 
     id: Dtype[int] = Col(Integer, primary_key=True, index=True)
 
-    # NOTE: This JWT token should not pass the maximum length but it also has
-    #   size less or equal than 8kb.
-    token: Dtype[str] = Col(
-        String(450), nullable=False, unique=True, index=True
+    # NOTE: The SHA-256 digest of the JWT token. It keeps the fixed size index
+    #   that smaller than the token itself and does not keep the token that
+    #   able to use if the database was leaked.
+    digest: Dtype[bytes] = Col(
+        LargeBinary(32), nullable=False, unique=True, index=True
     )
 
     is_active: Dtype[bool] = Col(Boolean, default=True)
@@ -91,7 +115,7 @@ class Token(Base):
         return (
             await session.execute(
                 select(cls).where(
-                    cls.token == token,
+                    cls.digest == token_digest(token),
                     cls.is_active == false(),
                 )
             )
@@ -104,7 +128,9 @@ class Token(Base):
         token: str,
     ) -> Self | None:
         return (
-            await session.execute(select(cls).where(cls.token == token))
+            await session.execute(
+                select(cls).where(cls.digest == token_digest(token))
+            )
         ).scalar_one_or_none()
 
     @classmethod
@@ -119,3 +145,76 @@ class Token(Base):
         await session.commit()
         await session.refresh(token)
         return token
+
+
+# NOTE: The legacy tokens table kept the raw token with its unique index. It
+#   will rename to this table, and all its rows will copy to the new tokens
+#   table with their digests.
+TOKENS_LEGACY: str = "tokens_legacy"
+
+
+# NOTE: This listener should run before the other listeners that create the
+#   missing indexes of the existing tables.
+@event.listens_for(Base.metadata, "after_create", insert=True)
+def migrate_legacy_tokens(_, connection: Connection, **kwargs) -> None:
+    """Migrate the legacy tokens table that does not have the digest column.
+    It renames the legacy table, creates the new tokens table, and copies the
+    rows with their digests in batches before drop the legacy table.
+    """
+    table: Table = Token.__table__
+    inspector = inspect(connection)
+    if "digest" in {
+        c["name"]
+        for c in inspector.get_columns(table.name, schema=table.schema)
+    }:
+        return
+
+    # NOTE: Drop the indexes of the legacy table because the new tokens table
+    #   will use the same names.
+    quote = connection.dialect.identifier_preparer.quote
+    for index in inspector.get_indexes(table.name, schema=table.schema):
+        connection.exec_driver_sql(
+            f"DROP INDEX {quote(table.schema)}.{quote(index['name'])}"
+        )
+    connection.exec_driver_sql(
+        f"ALTER TABLE {quote(table.schema)}.{quote(table.name)} "
+        f"RENAME TO {quote(TOKENS_LEGACY)}"
+    )
+    table.create(connection)
+
+    # NOTE: The legacy table uses the column types of the new tokens table, so
+    #   the copied values do not need to convert.
+    legacy = Table(
+        TOKENS_LEGACY,
+        MetaData(schema=table.schema),
+        Column("token", String),
+        *(
+            Column(c.name, c.type, primary_key=c.primary_key)
+            for c in table.columns
+            if c.name != "digest"
+        ),
+    )
+    columns: list[str] = [c.name for c in table.columns if c.name != "digest"]
+    last_id: int = 0
+    while rows := (
+        connection.execute(
+            select(legacy)
+            .where(legacy.c.id > last_id)
+            .order_by(legacy.c.id)
+            .limit(1000)
+        )
+        .mappings()
+        .all()
+    ):
+        connection.execute(
+            insert(table),
+            [
+                {
+                    **{c: row[c] for c in columns},
+                    "digest": token_digest(row["token"]),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1]["id"]
+    legacy.drop(connection)
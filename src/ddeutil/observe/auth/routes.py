@@ -14,7 +14,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..deps import get_async_session
 from ..utils import get_logger
-from .crud import TokenCRUD, authenticate, verify_refresh_token
+from .cache import revoked_tokens, token_claims, user_cache
+from .crud import TokenCRUD, UserCRUD, authenticate, verify_refresh_token
 from .deps import get_current_active_user, get_current_super_user
 from .models import User
 from .schemas import (
@@ -26,7 +27,9 @@ from .schemas import (
 from .securities import (
     create_access_token,
     create_refresh_token,
+    hash_pool,
 )
+from .sweeper import metrics as sweeper_metrics
 
 logger = get_logger("ddeutil.observe")
 auth = APIRouter(prefix="/auth", tags=["api", "auth"])
@@ -132,3 +135,45 @@ async def read_user_all(
     session: AsyncSession = Depends(get_async_session),
 ) -> list[UserSchema]:
     return await User.get_all(session)
+
+
+@auth.post(
+    path="/user/{username}/deactivate",
+    dependencies=[Depends(get_current_super_user)],
+)
+async def deactivate_user(
+    username: str,
+    service: UserCRUD = Depends(UserCRUD),
+) -> UserSchema:
+    """Deactivate a user, so its tokens can not access any routes."""
+    return await service.deactivate(username)
+
+
+@auth.delete(
+    path="/user/{username}",
+    status_code=st.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(get_current_super_user)],
+)
+async def delete_user(
+    username: str,
+    service: UserCRUD = Depends(UserCRUD),
+):
+    """Delete a user with its tokens."""
+    await service.delete(username)
+
+
+@auth.get(
+    path="/stats",
+    dependencies=[Depends(get_current_super_user)],
+)
+async def read_stats() -> dict[str, Any]:
+    """Get the statistic values of the in-process authentication caches, the
+    password hash pool, and the expired token sweeper.
+    """
+    return {
+        "password_hash": hash_pool.stats(),
+        "revoked_tokens": revoked_tokens.stats(),
+        "token_claims": token_claims.stats(),
+        "users": user_cache.stats(),
+        "token_sweeper": sweeper_metrics.model_dump(),
+    }
@@ -3,8 +3,13 @@
 # Licensed under the MIT License. See LICENSE in the project root for
 # license information.
 # ------------------------------------------------------------------------------
+import asyncio
+import hashlib
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 import bcrypt
 import jwt
@@ -18,6 +23,7 @@ from ..utils import get_logger
 
 logger = get_logger("ddeutil.observe")
 ALGORITHM: str = "HS256"
+T = TypeVar("T")
 
 
 class OAuth2PasswordBearerOrCookie(OAuth2PasswordBearer):
@@ -101,8 +107,10 @@ def create_access_token(
             minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
+    # NOTE: The unique token ID make two tokens that create in the same second
+    #   for the same subject do not equal.
     to_encode = subject.copy()
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, config.SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -118,11 +126,20 @@ def create_refresh_token(
             minutes=config.REFRESH_TOKEN_EXPIRE_MINUTES
         )
 
+    # NOTE: The unique token ID make two tokens that create in the same second
+    #   for the same subject do not equal.
     to_encode = subject.copy()
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, config.REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 
+def token_digest(token: str) -> bytes:
+    """Return the SHA-256 digest of a token that use to store and look up the
+    token instead of the token itself.
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Return True if the password is equal."""
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
@@ -133,6 +150,79 @@ def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
+class PasswordHashPool:
+    """Bounded thread pool that runs the bcrypt functions out of the event
+    loop. The bcrypt package releases the GIL while it hashes, so the other
+    requests still run on the event loop while a login is in flight.
+
+    :param max_workers: A maximum number of the hash functions that run
+        concurrently. The other calls will wait on the pool queue.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers: int = max(max_workers, 1)
+        self.queued: int = 0
+        self.running: int = 0
+        self.completed: int = 0
+        self.peak_queued: int = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="observe-hash",
+            )
+        return self._executor
+
+    def _call(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _done(self, future: Future) -> None:
+        # NOTE: The cancelled call does not start, so it should leave the queue
+        #   here.
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a function on this pool and wait for its result."""
+        with self._lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        future: Future = self._get_executor().submit(self._call, func, *args)
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int]:
+        """Return the statistic values of this pool."""
+        return {
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "peak_queued": self.peak_queued,
+        }
+
+    def shutdown(self) -> None:
+        """Shutdown the pool. It will create the new one on the next call."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = PasswordHashPool(max_workers=config.AUTH_HASH_WORKERS)
+
+
 def decode_access_token(token: str) -> dict[str, Any]:
     return jwt.decode(token, config.SECRET_KEY, algorithms=[ALGORITHM])
 
@@ -0,0 +1,108 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""
+The sweeper job of the expired tokens. A token row keeps its revoked state
+until it expires, and after that its JWT signature check fails by itself, so
+the row does not use anymore. This job deletes them with the bounded batches,
+where each batch is its own short transaction.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, select
+
+from ..conf import config
+from ..db import sessionmanager
+from ..utils import get_logger
+from .models import Token
+
+logger = get_logger("ddeutil.observe")
+
+
+class SweepResult(BaseModel):
+    """Result of one sweeper pass."""
+
+    deleted: int = 0
+    batches: int = 0
+    duration: float = 0.0
+    start_at: datetime = Field(default_factory=datetime.now)
+
+
+class SweepMetrics(BaseModel):
+    """Accumulated metrics of the sweeper passes on this process."""
+
+    runs: int = 0
+    deleted: int = 0
+    last: Optional[SweepResult] = None
+
+    def add(self, result: SweepResult) -> None:
+        self.runs += 1
+        self.deleted += result.deleted
+        self.last = result
+
+
+metrics = SweepMetrics()
+
+
+def expired_tokens(now: datetime, limit: int = 500):
+    """Return the select statement of the expired token IDs that use the
+    ``expires_at`` index.
+    """
+    return select(Token.id).where(Token.expires_at < now).limit(limit)
+
+
+async def sweep_expired_tokens(
+    batch_size: int = 500,
+    now: Optional[datetime] = None,
+) -> SweepResult:
+    """Delete the expired tokens in bounded batches.
+
+    :param batch_size: A maximum number of rows that delete in one transaction.
+    :param now: A datetime that compare with the token expire datetime.
+    """
+    result = SweepResult()
+    start: float = time.perf_counter()
+    now: datetime = now or datetime.now()
+
+    async with sessionmanager.session() as session:
+        while True:
+            rs = await session.execute(
+                delete(Token)
+                .where(Token.id.in_(expired_tokens(now, limit=batch_size)))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            result.deleted += rs.rowcount
+            result.batches += 1
+            if rs.rowcount < batch_size:
+                break
+            await asyncio.sleep(0)
+
+    result.duration = time.perf_counter() - start
+    metrics.add(result)
+    logger.info(
+        f"Sweeper deleted {result.deleted} expired tokens in "
+        f"{result.duration:.3f} sec."
+    )
+    return result
+
+
+async def sweep_forever(interval: int) -> None:
+    """Run the sweeper every interval seconds until this task was cancelled."""
+    while True:
+        try:
+            await sweep_expired_tokens(
+                batch_size=config.AUTH_TOKEN_SWEEP_BATCH_SIZE
+            )
+        except Exception as err:
+            logger.exception(f"Sweeper job was failed: {err}")
+        await asyncio.sleep(interval)
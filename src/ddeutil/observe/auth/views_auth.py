@@ -5,7 +5,7 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
-from typing import Annotated, Union
+from typing import Annotated, Optional, Union
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi import status as st
@@ -27,7 +27,11 @@ from .schemas import (
     UserSchema,
     UserScopeForm,
 )
-from .securities import create_access_token, create_refresh_token
+from .securities import (
+    OAuth2SchemaView,
+    create_access_token,
+    create_refresh_token,
+)
 
 auth = APIRouter(prefix="/auth", tags=["auth", "frontend"])
 
@@ -81,7 +85,11 @@ async def create_login_session(
     service: TokenCRUD,
     user: User | UserSchema,
     scopes: list[str],
-) -> Token:
+) -> str:
+    """Create the access and refresh tokens of a user, keep them on the
+    backend database, set the refresh token to the cookie, and return the
+    access token.
+    """
     # NOTE: OAuth2 with scopes such as `["me", ...]`.
     access_token = create_access_token(
         subject={
@@ -97,7 +105,7 @@ async def create_login_session(
     )
 
     # NOTE: Create token on the backend database.
-    token: Token = await service.create(
+    await service.create(
         TokenCreate(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -114,7 +122,7 @@ async def create_login_session(
         samesite="Lax",
         max_age=config.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
     )
-    return token
+    return access_token
 
 
 @auth.post("/login")
@@ -135,14 +143,14 @@ async def login(
         response.status_code = st.HTTP_404_NOT_FOUND
         return {}
 
-    token: Token = await create_login_session(
+    access_token: str = await create_login_session(
         response, service, user, scopes=form_scopes.scopes
     )
 
     response.headers["HX-Redirect"] = "/"
     response.status_code = st.HTTP_302_FOUND
     return {
-        "access_token": token.token,
+        "access_token": access_token,
         "exp": config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         "token_type": "Bearer",
     }
@@ -179,11 +187,11 @@ async def logout(
     response: Response,
     user: User = Depends(required_current_active_user),
     service: TokenCRUD = Depends(TokenCRUD),
+    refresh_token: Optional[str] = Depends(OAuth2SchemaView),
 ):
     await service.retention_by_user(user.id)
 
     db_tokens: list[Token] = []
-    refresh_token = request.cookies.get("refresh_token")
     if refresh_token:
         db_tokens: list[Token] = await service.update_logout(refresh_token)
 
@@ -195,7 +203,9 @@ async def logout(
     return {
         "message": "Logout Successfully",
         "logout": [
-            PlainTokenSchema.model_validate({"token": token.token}).model_dump()
-            for token in db_tokens
+            PlainTokenSchema.model_validate(
+                {"token": refresh_token}
+            ).model_dump()
+            for _ in db_tokens
         ],
     }
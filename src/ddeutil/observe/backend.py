@@ -13,7 +13,7 @@ from starlette.requests import HTTPConnection
 from starlette.responses import PlainTextResponse, Response
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from .auth.crud import verify_refresh_token
+from .auth.context import get_auth_context
 from .auth.deps import AnonymousUser, SessionUser, SimpleUser
 from .db import sessionmanager
 
@@ -45,12 +45,16 @@ class OAuth2Backend(Backend):
         authorization: Optional[str] = conn.cookies.get("refresh_token")
         scheme, token = get_authorization_scheme_param(authorization)
         if not authorization or scheme.lower() != "bearer":
-            token = None
+            return [], AnonymousUser()
 
-        # Note: If token does not valid, it will return anonymous user.
+        # Note: If token does not valid, it will return anonymous user. The
+        #   verified token and its owner keep on the request auth context, so
+        #   the dependencies of this request do not query them again.
         async with sessionmanager.session() as session:
             if (
-                token_data := await verify_refresh_token(token, session)
+                token_data := await get_auth_context(conn).verify_refresh_token(
+                    token, session
+                )
             ) is None:
                 return [], AnonymousUser()
 
@@ -61,6 +65,18 @@ class OAuth2Backend(Backend):
 
 
 class OAuth2Middleware:
+    """OAuth2 Middleware that authenticate the incoming connection with the
+    backend object and set the auth scopes and user to the connection scope.
+
+    :param app: An ASGI application.
+    :param backend: An authentication backend object.
+    :param on_error: A function that return the response when the backend
+        raise an authentication error.
+    :param skip_paths: A list of paths that will not authenticate and set the
+        anonymous user instead, such as static files or a health check. A path
+        that end with ``*`` will match with its prefix.
+    """
+
     def __init__(
         self,
         app: ASGIApp,
@@ -68,9 +84,17 @@ class OAuth2Middleware:
         on_error: (
             Callable[[HTTPConnection, AuthenticationError], Response] | None
         ) = None,
+        skip_paths: list[str] | None = None,
     ) -> None:
         self.app = app
         self.backend = backend
+        skip_paths: list[str] = skip_paths or []
+        self.skip_exact: frozenset[str] = frozenset(
+            p for p in skip_paths if not p.endswith("*")
+        )
+        self.skip_prefix: tuple[str, ...] = tuple(
+            p.rstrip("*") for p in skip_paths if p.endswith("*")
+        )
         self.on_error: Callable[
             [HTTPConnection, AuthenticationError],
             Response,
@@ -88,6 +112,11 @@ class OAuth2Middleware:
             await self.app(scope, receive, send)
             return
 
+        if self.is_skip(scope["path"]):
+            scope["auth"], scope["user"] = [], AnonymousUser()
+            await self.app(scope, receive, send)
+            return
+
         conn = HTTPConnection(scope)
         try:
             auth_result = await self.backend.authenticate(conn)
@@ -102,6 +131,12 @@ class OAuth2Middleware:
         scope["auth"], scope["user"] = auth_result
         await self.app(scope, receive, send)
 
+    def is_skip(self, path: str) -> bool:
+        """Return True if the path does not need to authenticate."""
+        return path in self.skip_exact or (
+            bool(self.skip_prefix) and path.startswith(self.skip_prefix)
+        )
+
     @staticmethod
     def default_on_error(_: HTTPConnection, exc: Exception) -> Response:
         return PlainTextResponse(str(exc), status_code=400)
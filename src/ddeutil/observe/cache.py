@@ -0,0 +1,105 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-process cache that evict the least recently used item when
+    it is full, and drop an item when it lives longer than its time-to-live.
+
+    This object does not use any lock because it will use on the event
+    loop thread only. It keeps hit and miss counters for tuning its size and
+    its time-to-live value.
+
+    :param maxsize: A maximum number of items in this cache.
+    :param ttl: A default time-to-live value in seconds of each item.
+    :param timer: A monotonic clock function that use for testing.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.timer: Callable[[], float] = timer
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return (item := self._data.get(key)) is not None and item[
+            0
+        ] > self.timer()
+
+    def get(self, key: K, default: Any = None) -> Optional[V]:
+        """Return a value of the key if it exists and does not expire yet."""
+        if (item := self._data.get(key)) is None:
+            self.misses += 1
+            return default
+
+        expire, value = item
+        if expire <= self.timer():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Set a value of the key with its time-to-live in seconds. The least
+        recently used item will evict if this cache is full.
+        """
+        ttl: float = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (self.timer() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default: Any = None) -> Optional[V]:
+        """Remove the key from this cache and return its value."""
+        if (item := self._data.pop(key, None)) is None:
+            return default
+        return item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total: int = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Return the statistic values of this cache."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
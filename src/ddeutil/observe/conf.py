@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import secrets
+from typing import Optional
 
 from ddeutil.core import str2bool
 from dotenv import load_dotenv
@@ -37,17 +38,108 @@ class BaseConfig:
             DB_NAME=env("OBSERVE_DB_NAME", "observe.db"),
         ),
     )
+
+    # NOTE: The connection pool options that pass to the queue pool of the
+    #   server databases like PostgreSQL. Each worker process has its own
+    #   pool, so the database should allow the number of workers times the
+    #   pool size plus its overflow connections. The SQLite database does
+    #   not use these options.
+    DB_POOL_SIZE: int = int(env("OBSERVE_DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(env("OBSERVE_DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(env("OBSERVE_DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(env("OBSERVE_DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = str2bool(env("OBSERVE_DB_POOL_PRE_PING", "false"))
+
+    # NOTE: An optional database url of the read-only engine like a replica
+    #   database. It can set to the same SQLite database file for reading
+    #   with the other connections that use the query only mode.
+    OBSERVE_SQLALCHEMY_DB_ASYNC_READ_URL: Optional[str] = (
+        env("OBSERVE_SQLALCHEMY_DB_ASYNC_READ_URL") or None
+    )
+
+    # NOTE: The single writer queue that runs the write operations of the
+    #   release ingest and the tokens together in batched transactions. It
+    #   avoids waiting for the write lock of SQLite on the bursty traffic.
+    DB_WRITE_QUEUE: bool = str2bool(env("OBSERVE_DB_WRITE_QUEUE", "false"))
+    DB_WRITE_QUEUE_BATCH_SIZE: int = int(
+        env("OBSERVE_DB_WRITE_QUEUE_BATCH_SIZE", "100")
+    )
+    DB_WRITE_QUEUE_MAXSIZE: int = int(
+        env("OBSERVE_DB_WRITE_QUEUE_MAXSIZE", "10000")
+    )
+
     LOG_DEBUG_MODE: bool = str2bool(env("OBSERVE_LOG_DEBUG_MODE", "true"))
     LOG_SQLALCHEMY_DEBUG_MODE: bool = str2bool(
         env("OBSERVE_LOG_SQLALCHEMY_DEBUG_MODE", "false")
     )
 
+    # NOTE: The SQL statement profiler that aggregates the execution time of
+    #   each statement shape. The statement that takes longer than the slow
+    #   query threshold (milliseconds) will log with its route.
+    SQL_PROFILER: bool = str2bool(env("OBSERVE_SQL_PROFILER", "true"))
+    SQL_SLOW_QUERY_MS: int = int(env("OBSERVE_SQL_SLOW_QUERY_MS", "100"))
+    SQL_PROFILER_MAXSIZE: int = int(env("OBSERVE_SQL_PROFILER_MAXSIZE", "500"))
+
     # NOTE:
     #   * token:    30 minutes                      = 30 minutes
     #   * refresh:  60 minutes * 24 hours * 8 days  = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
 
+    # NOTE: An in-process cache of the token revocation state that avoid
+    #   querying the tokens table on every request. The active state lives
+    #   until its TTL (seconds) and the revoked state lives until the refresh
+    #   token expire.
+    AUTH_TOKEN_CACHE_TTL: int = int(env("OBSERVE_AUTH_TOKEN_CACHE_TTL", "60"))
+    AUTH_TOKEN_CACHE_MAXSIZE: int = int(
+        env("OBSERVE_AUTH_TOKEN_CACHE_MAXSIZE", "10000")
+    )
+
+    # NOTE: A maximum number of the decoded token claims that keep on the
+    #   in-process cache. Each claims will keep until its token expire.
+    AUTH_TOKEN_CLAIMS_CACHE_MAXSIZE: int = int(
+        env("OBSERVE_AUTH_TOKEN_CLAIMS_CACHE_MAXSIZE", "10000")
+    )
+
+    # NOTE: An in-process cache of the user rows that the authentication loads
+    #   on every protected request. The other processes can see the old user
+    #   after it changes until the TTL (seconds), and a zero TTL disables it.
+    AUTH_USER_CACHE_TTL: int = int(env("OBSERVE_AUTH_USER_CACHE_TTL", "30"))
+    AUTH_USER_CACHE_MAXSIZE: int = int(
+        env("OBSERVE_AUTH_USER_CACHE_MAXSIZE", "1000")
+    )
+
+    # NOTE: The background sweeper that deletes the expired tokens every
+    #   interval (seconds). A zero interval disables it.
+    AUTH_TOKEN_SWEEP_INTERVAL: int = int(
+        env("OBSERVE_AUTH_TOKEN_SWEEP_INTERVAL", "600")
+    )
+    AUTH_TOKEN_SWEEP_BATCH_SIZE: int = int(
+        env("OBSERVE_AUTH_TOKEN_SWEEP_BATCH_SIZE", "500")
+    )
+
+    # NOTE: The rate limit rules of this tier name will load from the rate
+    #   limit table at the application startup. The counters keep on memory
+    #   with the maximum number of the users and client hosts.
+    RATELIMIT_TIER: str = env("OBSERVE_RATELIMIT_TIER", "default")
+    RATELIMIT_MAXSIZE: int = int(env("OBSERVE_RATELIMIT_MAXSIZE", "100000"))
+
+    # NOTE: A number of threads that hash and verify the passwords with bcrypt
+    #   out of the event loop. A bcrypt call takes about 200 ms of CPU, so it
+    #   should not more than the number of CPU cores.
+    AUTH_HASH_WORKERS: int = int(env("OBSERVE_AUTH_HASH_WORKERS", "4"))
+
+    # NOTE: Paths that the authentication middleware will skip. A path that
+    #   end with `*` will match with its prefix.
+    AUTH_SKIP_PATHS: list[str] = [
+        p.strip()
+        for p in env(
+            "OBSERVE_AUTH_SKIP_PATHS",
+            f"/static/*,/favicon.ico,{API_PREFIX}/",
+        ).split(",")
+        if p.strip()
+    ]
+
     # NOTE: Secret keys that use to hash any jwt token generated value.
     SECRET_KEY: str = env(
         "OBSERVE_CORE_ACCESS_SECRET_KEY", secrets.token_urlsafe(32)
@@ -56,6 +148,59 @@ class BaseConfig:
         "OBSERVE_REFRESH_SECRET_KEY", secrets.token_urlsafe(32)
     )
 
+    # NOTE: A maximum number of workflow logs that will insert and commit in
+    #   one chunk when it receives from the streaming ingest endpoint.
+    WORKFLOW_INGEST_CHUNK_SIZE: int = int(
+        env("OBSERVE_WORKFLOW_INGEST_CHUNK_SIZE", "1000")
+    )
+
+    # NOTE: A maximum number of bytes of one log line on the streaming ingest
+    #   endpoint. The longer line will reject with the 413 status.
+    WORKFLOW_INGEST_MAX_LINE: int = int(
+        env("OBSERVE_WORKFLOW_INGEST_MAX_LINE", "1048576")
+    )
+
+    # NOTE: A number of workflows that fetch from the database cursor at a
+    #   time when it streams all workflows to the client.
+    WORKFLOW_STREAM_PARTITION: int = int(
+        env("OBSERVE_WORKFLOW_STREAM_PARTITION", "500")
+    )
+
+    # NOTE: Compress the context of the workflow logs with zlib and a shared
+    #   dictionary. It can enable on the existing SQLite database because it
+    #   still reads the plain JSON values, but it should not disable after
+    #   the compressed logs were written.
+    WORKFLOW_LOG_COMPRESS: bool = str2bool(
+        env("OBSERVE_WORKFLOW_LOG_COMPRESS", "false")
+    )
+
+    # NOTE: The retention policy of the workflow releases and logs. A release
+    #   will delete if it is not in the latest N releases of its workflow or
+    #   it is older than N days. A zero value disables that rule, and a zero
+    #   interval (seconds) disables the background retention task.
+    WORKFLOW_RETENTION_KEEP_RELEASES: int = int(
+        env("OBSERVE_WORKFLOW_RETENTION_KEEP_RELEASES", "0")
+    )
+    WORKFLOW_RETENTION_KEEP_DAYS: int = int(
+        env("OBSERVE_WORKFLOW_RETENTION_KEEP_DAYS", "0")
+    )
+    WORKFLOW_RETENTION_BATCH_SIZE: int = int(
+        env("OBSERVE_WORKFLOW_RETENTION_BATCH_SIZE", "500")
+    )
+    WORKFLOW_RETENTION_INTERVAL: int = int(
+        env("OBSERVE_WORKFLOW_RETENTION_INTERVAL", "3600")
+    )
+
+    # NOTE: The Jinja2 templates options. The auto reload option will check the
+    #   template files was changed on every render, so it should enable on the
+    #   development only.
+    WEB_TEMPLATES_AUTO_RELOAD: bool = str2bool(
+        env("OBSERVE_WEB_TEMPLATES_AUTO_RELOAD", "false")
+    )
+    WEB_TEMPLATES_BYTECODE_CACHE: bool = str2bool(
+        env("OBSERVE_WEB_TEMPLATES_BYTECODE_CACHE", "true")
+    )
+
     WEB_ADMIN_USER: str = env("OBSERVE_WEB_ADMIN_USER", "observe")
     WEB_ADMIN_PASS: str = env("OBSERVE_WEB_ADMIN_PASS", "observe")
     WEB_ADMIN_EMAIL: str = env("OBSERVE_WEB_ADMIN_EMAIL", "observe@mail.com")
@@ -8,7 +8,7 @@ from __future__ import annotations
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .deps import get_async_session
+from .deps import get_async_read_session, get_async_session
 
 
 class BaseCRUD:
@@ -17,3 +17,13 @@ class BaseCRUD:
         session: AsyncSession = Depends(get_async_session),
     ) -> None:
         self.async_session: AsyncSession = session
+
+    @classmethod
+    def read_only(
+        cls,
+        session: AsyncSession = Depends(get_async_read_session),
+    ):
+        """Return this CRUD object with the read-only session that use on the
+        dependency of the route that does not write.
+        """
+        return cls(session)
@@ -5,13 +5,17 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import json
 import time
-from collections.abc import AsyncIterator
+import zlib
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable, Sequence
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, Optional
 
 from sqlalchemy import MetaData, event, inspect
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import URL, Connection, Dialect, Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     AsyncConnection,
@@ -23,11 +27,14 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
-    Session,
     mapped_column,
 )
+from sqlalchemy.pool import Pool, QueuePool
+from sqlalchemy.types import LargeBinary, TypeDecorator
 
 from .conf import config
+from .metrics import Histogram
+from .profiler import profiler  # noqa: F401
 from .utils import get_logger
 
 logger = get_logger("ddeutil.observe")
@@ -53,6 +60,10 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
         #
         #   Ref: https://forum.qt.io/topic/139657/multithreading-with-sqlite/
         #
+        # NOTE: The incremental auto vacuum mode let the retention job return
+        #   the free pages to the file system. It takes effect only when it
+        #   sets before the first table was created on the database file.
+        "auto_vacuum": "'INCREMENTAL'",
         "journal_mode": "'WAL'",
         "locking_mode": "'NORMAL'",
         "synchronous": "'OFF'",
@@ -67,62 +78,182 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.close()
 
 
-if config.LOG_SQLALCHEMY_DEBUG_MODE:
-
-    @event.listens_for(Engine, "before_cursor_execute")
-    def before_cursor_execute(
-        conn, cursor, statement, parameters, context, executemany
-    ):
-        conn.info.setdefault("query_start_time", []).append(time.time())
-        logger.debug("Start Query: %s", statement)
-
-    @event.listens_for(Engine, "after_cursor_execute")
-    def after_cursor_execute(
-        conn, cursor, statement, parameters, context, executemany
-    ):
-        total = time.time() - conn.info["query_start_time"].pop(-1)
-        logger.debug("Query Complete! Total Time: %f", total)
-
-    @event.listens_for(Session, "before_commit")
-    def before_commit(session):
-        logger.debug(f"before commit: {session.info}")
-        session.info["before_commit_hook"] = "yup"
-
-    @event.listens_for(Session, "after_commit")
-    def after_commit(session):
-        logger.debug(
-            f"before commit: {session.info['before_commit_hook']}, "
-            f"after update: {session.info.get('after_update_hook', 'null')}"
+def engine_options(host: str | URL) -> dict[str, Any]:
+    """Return the engine options of the database url that depend on its
+    dialect. The pool sizing options pass to the queue pool only, because the
+    SQLite file database uses the null pool that opens a connection per
+    checkout, and the SQLite memory database uses the static pool.
+    """
+    url: URL = make_url(host)
+    dialect: type[Dialect] = url.get_dialect()
+    options: dict[str, Any] = {
+        "poolclass": dialect.get_pool_class(url),
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    if issubclass(options["poolclass"], QueuePool):
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
         )
+    return options
+
+
+class PoolMetrics:
+    """Metrics of the connection pool of one engine that use for sizing the
+    pool. The wait histogram keeps the seconds that a checkout waits for the
+    pool, that include the time of opening a new connection.
+    """
+
+    def __init__(self) -> None:
+        self.connects: int = 0
+        self.checkouts: int = 0
+        self.checked_out: int = 0
+        self.peak_checked_out: int = 0
+        self.timeouts: int = 0
+        self.wait: Histogram = Histogram()
+
+    def instrument(self, poolclass: type[Pool]) -> type[Pool]:
+        """Return the subclass of a pool class that observe the wait time of
+        its checkout. It keeps this subclass when the engine recreates its pool
+        on the dispose step.
+        """
+        metrics: PoolMetrics = self
+
+        class InstrumentedPool(poolclass):
+            def connect(self):
+                start: float = time.perf_counter()
+                try:
+                    return super().connect()
+                except PoolTimeoutError:
+                    metrics.timeouts += 1
+                    raise
+                finally:
+                    metrics.wait.observe(time.perf_counter() - start)
+
+        InstrumentedPool.__name__ = f"Instrumented{poolclass.__name__}"
+        return InstrumentedPool
+
+    def listen(self, engine: Engine) -> None:
+        """Listen the pool events of an engine."""
+
+        @event.listens_for(engine, "connect")
+        def connect(dbapi_connection, connection_record):
+            self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+        @event.listens_for(engine, "checkin")
+        def checkin(dbapi_connection, connection_record):
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def stats(self, pool: Optional[Pool] = None) -> dict[str, Any]:
+        """Return the statistic values of this metrics and the current state
+        of the pool.
+        """
+        rs: dict[str, Any] = {
+            "pool": pool.__class__.__name__ if pool else None,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "timeouts": self.timeouts,
+            "wait": self.wait.stats(),
+        }
+        if isinstance(pool, QueuePool):
+            rs.update(size=pool.size(), overflow=pool.overflow())
+        return rs
+
+
+def set_sqlite_query_only(dbapi_connection, connection_record):
+    """Set the query only pragma to the SQLite connection of the read-only
+    engine, so any write statement on it will raise an error.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only = ON;")
+    cursor.close()
 
 
 class DBSessionManager:
     """Database session manager object for creating engine and session mapping
     with host url string on the FastAPI lifespan step.
+
+    It can have an optional read-only engine, like a replica database or the
+    other connections of the same SQLite file, so the heavy read queries do
+    not use the same connections of the write queries. The read-only session
+    will use the write engine if it does not set.
     """
 
     def __init__(self):
         self._engine: AsyncEngine | None = None
         self._sessionmaker: async_sessionmaker | None = None
+        self._read_engine: AsyncEngine | None = None
+        self._read_sessionmaker: async_sessionmaker | None = None
+        self.metrics: PoolMetrics = PoolMetrics()
+        self.read_metrics: PoolMetrics = PoolMetrics()
 
-    def init(self, host: str):
-        self._engine = create_async_engine(
-            host,
-            echo=False,
-            pool_pre_ping=False,
-            connect_args={"check_same_thread": False},
+    @staticmethod
+    def create_engine(host: str, metrics: PoolMetrics) -> AsyncEngine:
+        options: dict[str, Any] = engine_options(host)
+        options["poolclass"] = metrics.instrument(options["poolclass"])
+        engine: AsyncEngine = create_async_engine(
+            host, echo=config.LOG_SQLALCHEMY_DEBUG_MODE, **options
         )
-        self._sessionmaker = async_sessionmaker(
+        metrics.listen(engine.sync_engine)
+        return engine
+
+    @staticmethod
+    def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker:
+        return async_sessionmaker(
             autoflush=False,
             autocommit=False,
             future=True,
             expire_on_commit=False,
-            bind=self._engine,
+            bind=engine,
         )
 
+    def init(self, host: str, read_host: Optional[str] = None):
+        self.metrics = PoolMetrics()
+        self._engine = self.create_engine(host, self.metrics)
+        self._sessionmaker = self.create_sessionmaker(self._engine)
+
+        if read_host:
+            self.read_metrics = PoolMetrics()
+            self._read_engine = self.create_engine(read_host, self.read_metrics)
+            if self._read_engine.dialect.name == "sqlite":
+                event.listen(
+                    self._read_engine.sync_engine,
+                    "connect",
+                    set_sqlite_query_only,
+                )
+            self._read_sessionmaker = self.create_sessionmaker(
+                self._read_engine
+            )
+
     def is_opened(self) -> bool:
         return self._engine is not None
 
+    def has_read_engine(self) -> bool:
+        return self._read_engine is not None
+
+    def pool_stats(self, read_only: bool = False) -> dict[str, Any]:
+        """Return the statistic values of the connection pool. It returns the
+        statistic values of the write pool if the read-only engine does not
+        set.
+        """
+        if read_only and self._read_engine is not None:
+            return self.read_metrics.stats(self._read_engine.sync_engine.pool)
+        return self.metrics.stats(
+            self._engine.sync_engine.pool if self._engine else None
+        )
+
     async def close(self):
         if self._engine is None:
             raise DatabaseManageException(
@@ -132,6 +263,11 @@ class DBSessionManager:
         self._engine = None
         self._sessionmaker = None
 
+        if self._read_engine is not None:
+            await self._read_engine.dispose()
+            self._read_engine = None
+            self._read_sessionmaker = None
+
     @asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
         if self._engine is None:
@@ -147,13 +283,22 @@ class DBSessionManager:
                 raise
 
     @asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
-        if self._sessionmaker is None:
+    async def session(
+        self,
+        read_only: bool = False,
+    ) -> AsyncIterator[AsyncSession]:
+        """Return the session of the write engine, or the read-only engine if
+        the read only flag was set.
+        """
+        maker: async_sessionmaker | None = (
+            self._read_sessionmaker if read_only else None
+        ) or self._sessionmaker
+        if maker is None:
             raise DatabaseManageException(
                 "DatabaseSessionManager is not initialized"
             )
 
-        session: AsyncSession = self._sessionmaker()
+        session: AsyncSession = maker()
         try:
             yield session
         except Exception:
@@ -215,6 +360,124 @@ class Base(AsyncAttrs, DeclarativeBase):
         return f"<{self.__class__.__name__}({columns})>"
 
 
+def train_zdict(samples: Iterable[Any], size: int = 8192) -> bytes:
+    """Return the shared dictionary for the zlib compression that train from
+    the sample JSON values. It keeps the most common JSON tokens of the samples
+    and puts the most common one at the end of the dictionary because zlib
+    encodes a closer match with a shorter distance.
+
+    :param samples: The sample JSON values that look like the real values.
+    :param size: A maximum size in bytes of the dictionary. It should not more
+        than the zlib window size, 32 KB.
+    """
+    counter: Counter[bytes] = Counter()
+    for sample in samples:
+        data: bytes = json.dumps(sample, separators=(",", ":")).encode()
+        for token in set(data.replace(b"{", b",").split(b",")):
+            if len(token) > 2:
+                counter[token + b","] += 1
+
+    tokens: list[bytes] = []
+    total: int = 0
+    for token, _ in counter.most_common():
+        if total + len(token) > size:
+            break
+        tokens.append(token)
+        total += len(token)
+    return b"".join(reversed(tokens))
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON type that compresses the value with zlib and a shared dictionary
+    on write and decompresses it on read, so a lot of small and repetitive
+    JSON values take less space than the plain JSON type.
+
+    A value that smaller than the minimum size stores as the plain JSON bytes.
+    The compressed value keeps the zlib stream header that has the checksum of
+    its dictionary, so it can read the value that compressed with an old
+    dictionary and the legacy JSON text value that wrote by the JSON type.
+
+    :param zdict: A shared dictionary that use to compress the new values.
+    :param level: A zlib compression level.
+    :param min_size: A minimum size in bytes of the JSON value that compress.
+    :param old_zdicts: The old dictionaries that use to decompress only.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(
+        self,
+        zdict: Optional[bytes] = None,
+        level: int = 6,
+        min_size: int = 64,
+        old_zdicts: Sequence[bytes] = (),
+    ) -> None:
+        super().__init__()
+        self.zdict: Optional[bytes] = zdict
+        self.level: int = level
+        self.min_size: int = min_size
+        self.old_zdicts: tuple[bytes, ...] = tuple(old_zdicts)
+        self._zdicts: dict[int, bytes] = {
+            zlib.adler32(d): d for d in (*self.old_zdicts, zdict) if d
+        }
+
+    def process_bind_param(
+        self, value: Any, dialect: Dialect
+    ) -> Optional[bytes]:
+        if value is None:
+            return None
+
+        data: bytes = json.dumps(value, separators=(",", ":")).encode()
+        if len(data) < self.min_size:
+            return data
+
+        if self.zdict:
+            compressor = zlib.compressobj(self.level, zdict=self.zdict)
+        else:
+            compressor = zlib.compressobj(self.level)
+        compressed: bytes = compressor.compress(data) + compressor.flush()
+        return compressed if len(compressed) < len(data) else data
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return json.loads(value)
+
+        value = bytes(value)
+        # NOTE: A JSON value does not start with the zlib header byte, 0x78,
+        #   and the FDICT flag of the second byte mark the 4 bytes of the
+        #   dictionary checksum after that.
+        #
+        #   Read more: https://www.rfc-editor.org/rfc/rfc1950#section-2.2
+        #
+        if value[:1] != b"\x78":
+            return json.loads(value)
+        if not value[1] & 0x20:
+            return json.loads(zlib.decompress(value))
+
+        dict_id: int = int.from_bytes(value[2:6], "big")
+        if (zdict := self._zdicts.get(dict_id)) is None:
+            raise ValueError(
+                f"Compressed JSON value use the unknown dictionary: {dict_id}"
+            )
+        decompressor = zlib.decompressobj(zdict=zdict)
+        return json.loads(decompressor.decompress(value) + decompressor.flush())
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_missing_indexes(
+    target: MetaData, connection: Connection, **kwargs
+) -> None:
+    """Create the indexes that were added after their tables already exist on
+    the database because the ``create_all`` method does not create them.
+    """
+    for table in target.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
 # NOTE: Alias function of the SQLAlchemy for shorter name.
 Col = mapped_column
 Dtype = Mapped
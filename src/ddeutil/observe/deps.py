@@ -10,36 +10,87 @@ from pathlib import Path
 
 from fastapi import Request
 from fastapi.templating import Jinja2Templates
-from jinja2 import ChoiceLoader, FileSystemLoader
+from jinja2 import (
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .conf import config
 from .db import sessionmanager
 
+# NOTE: The registry of templates object for each route prefix. It keeps the
+#   Jinja2 environment alive, so the compiled templates will cache across the
+#   requests instead of parsing them on every request.
+TEMPLATES: dict[str, Jinja2Templates] = {}
 
-def get_templates(request: Request) -> Jinja2Templates:
-    """Dynamic multi-templating Jinja2 loader that support templates inside
-    APIRouter.
+
+def build_templates(route: str) -> Jinja2Templates:
+    """Build the templates object with the Jinja2 environment that load from
+    the templates directory of a route first and then the root templates
+    directory.
+
+    :param route: A route prefix such as ``workflow``, or the empty string for
+        the root templates directory only.
     """
     choices: list[FileSystemLoader] = [FileSystemLoader("./templates")]
-    if request.url.path != "/":
-        route: str = request.url.path.strip("/").split("/")[0]
-        route_path: Path = Path(__file__).parent / f"routes/{route}/templates"
-
-        # NOTE: Check route path exists on the current request.
-        if route_path.exists():
-            choices.insert(0, FileSystemLoader(route_path))
-        else:
-            auth_path: Path = Path(__file__).parent / "auth/templates"
-            if auth_path.exists():
-                choices.insert(0, FileSystemLoader(auth_path))
-
-    return Jinja2Templates(
-        directory="templates",
+    if route:
+        choices.insert(
+            0, FileSystemLoader(Path(__file__).parent / f"{route}/templates")
+        )
+    env = Environment(
         loader=ChoiceLoader(choices),
+        autoescape=True,
+        auto_reload=config.WEB_TEMPLATES_AUTO_RELOAD,
+        bytecode_cache=(
+            FileSystemBytecodeCache()
+            if config.WEB_TEMPLATES_BYTECODE_CACHE
+            else None
+        ),
     )
+    return Jinja2Templates(env=env)
+
+
+def init_templates() -> None:
+    """Build the templates object of every route prefix that has its own
+    templates directory. This function should call on the application startup.
+    """
+    TEMPLATES[""] = build_templates("")
+    TEMPLATES["auth"] = build_templates("auth")
+    for path in (Path(__file__).parent / "routes").glob("*/templates"):
+        TEMPLATES[path.parent.name] = build_templates(
+            f"routes/{path.parent.name}"
+        )
+
+
+def get_templates(request: Request) -> Jinja2Templates:
+    """Dynamic multi-templating Jinja2 loader that support templates inside
+    APIRouter. It returns the templates object from the registry that build
+    on the application startup.
+    """
+    if not TEMPLATES:
+        init_templates()
+
+    if request.url.path == "/":
+        return TEMPLATES[""]
+
+    # NOTE: The route that does not have its own templates will use the auth
+    #   templates.
+    route: str = request.url.path.strip("/").split("/")[0]
+    return TEMPLATES.get(route, TEMPLATES["auth"])
 
 
 async def get_async_session() -> AsyncIterator[AsyncSession]:
     """Return the database local session instance."""
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_async_read_session() -> AsyncIterator[AsyncSession]:
+    """Return the database local session instance of the read-only engine.
+    It should use on the dependency of the route that does not write.
+    """
+    async with sessionmanager.session(read_only=True) as session:
+        yield session
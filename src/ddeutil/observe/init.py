@@ -15,20 +15,22 @@ import asyncio
 from sqlalchemy import insert, select
 
 from .auth.models.user import User
-from .auth.securities import get_password_hash
+from .auth.securities import get_password_hash, hash_pool
 from .conf import config
 from .db import sessionmanager
 from .deps import get_async_session
 from .utils import get_logger
 
 logger = get_logger("ddeutil.observe")
-sessionmanager.init(config.OBSERVE_SQLALCHEMY_DB_ASYNC_URL)
+sessionmanager.init(
+    config.OBSERVE_SQLALCHEMY_DB_ASYNC_URL,
+    config.OBSERVE_SQLALCHEMY_DB_ASYNC_READ_URL,
+)
 
 
 async def create_admin(session) -> None:
     username: str = config.WEB_ADMIN_USER
     email: str = config.WEB_ADMIN_EMAIL
-    hashed_password = get_password_hash(config.WEB_ADMIN_PASS)
 
     # NOTE: Check this user already exists on the current backend database.
     user: User | None = (
@@ -38,6 +40,9 @@ async def create_admin(session) -> None:
     ).scalar_one_or_none()
 
     if user is None:
+        hashed_password = await hash_pool.run(
+            get_password_hash, config.WEB_ADMIN_PASS
+        )
         async with sessionmanager.connect() as conn:
             await conn.execute(
                 insert(User).values(
@@ -0,0 +1,194 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import bisect
+from collections.abc import Sequence
+from typing import Any
+
+# NOTE: The default buckets in seconds that cover from a fast cache hit to a
+#   slow database call.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Fixed buckets histogram that keep the count of the observed values
+    that are less than or equal to each bucket upper bound, and the overflow
+    bucket for the larger values.
+
+    This object does not use any lock because it will use on the event
+    loop thread only.
+
+    :param buckets: A sorted sequence of the bucket upper bounds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket that contains the quantile.
+        It returns the maximum observed value if it is on the overflow bucket.
+        """
+        if self.count == 0:
+            return 0.0
+        rank: float = q * self.count
+        cumulative: int = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.max
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Return the statistic values of this histogram, where the buckets
+        are the cumulative counts of each upper bound.
+        """
+        cumulative: int = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[f"{bound:g}"] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+def escape(value: str) -> str:
+    """Escape a label value of the Prometheus text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def route_name(scope: dict[str, Any]) -> str:
+    """Return the route template of a request scope like ``/workflow/{name}``
+    that keep the number of the metrics labels bounded. It returns the mount
+    path for the mounted application and ``unmatched`` for the unknown path.
+    """
+    if (route := scope.get("route")) is not None:
+        return route.path_format
+    if scope.get("endpoint") is not None and scope.get("root_path"):
+        return f"{scope['root_path']}/*"
+    return "unmatched"
+
+
+class RouteMetrics:
+    """Latency histograms of the requests that keyed by the method, the route
+    template, and the response status, with the in-flight requests gauge.
+
+    :param buckets: A sorted sequence of the bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self.histograms: dict[tuple[str, str, int], Histogram] = {}
+        self.in_flight: int = 0
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+    ) -> None:
+        key: tuple[str, str, int] = (method, route, status)
+        if (histogram := self.histograms.get(key)) is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def reset(self) -> None:
+        self.histograms.clear()
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Return the statistic values of each route that sort by the total
+        seconds, so the route that use the most latency budget come first.
+        """
+        return [
+            {
+                "method": method,
+                "route": route,
+                "status": status,
+                "count": histogram.count,
+                "sum": round(histogram.sum, 6),
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "p99": histogram.quantile(0.99),
+            }
+            for (method, route, status), histogram in sorted(
+                self.histograms.items(), key=lambda item: -item[1].sum
+            )
+        ]
+
+    def render(self, prefix: str = "observe") -> str:
+        """Return the metrics with the Prometheus text exposition format. It
+        does not export the quantiles, because the ``histogram_quantile``
+        function of PromQL computes them from the buckets.
+        """
+        name: str = f"{prefix}_http_request_duration_seconds"
+        lines: list[str] = [
+            f"# HELP {prefix}_http_requests_in_flight "
+            "A number of the requests that are processing.",
+            f"# TYPE {prefix}_http_requests_in_flight gauge",
+            f"{prefix}_http_requests_in_flight {self.in_flight}",
+            f"# HELP {name} A latency of the requests in seconds.",
+            f"# TYPE {name} histogram",
+        ]
+        for (method, route, status), histogram in sorted(
+            self.histograms.items()
+        ):
+            labels: str = (
+                f'method="{method}",route="{escape(route)}",status="{status}"'
+            )
+            cumulative: int = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+                )
+            lines.append(
+                f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+            )
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+route_metrics = RouteMetrics()
@@ -0,0 +1,76 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import RouteMetrics, route_metrics, route_name
+from .profiler import count_queries, request_scope
+
+
+class ProcessTimeMiddleware:
+    """Process time middleware that add the process time, the number of SQL
+    statements, and their total time of the request to the response headers,
+    and observe the latency histogram of its route template and status.
+
+    The headers have the time until the response start, but the histogram
+    has the time until the response body was sent completely.
+
+    :param app: An ASGI application.
+    :param metrics: A route metrics object.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RouteMetrics = route_metrics,
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: int = 500
+        start_time: float = time.perf_counter()
+        token = request_scope.set(scope)
+        self.metrics.in_flight += 1
+        with count_queries() as queries:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "X-Process-Time",
+                        str(time.perf_counter() - start_time),
+                    )
+                    headers.append("X-DB-Queries", str(queries.queries))
+                    headers.append("X-DB-Time", str(queries.seconds))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self.metrics.in_flight -= 1
+                self.metrics.observe(
+                    scope["method"],
+                    route_name(scope),
+                    status_code,
+                    time.perf_counter() - start_time,
+                )
+                request_scope.reset(token)
@@ -0,0 +1,230 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""
+The SQL statement profiler that aggregates the execution time of each
+statement shape. A statement shape is its SQL string after replacing the
+literal values and collapsing the repeated parameter groups, so the
+statements that differ by their parameters only share the same statistics.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Literal, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .conf import config
+from .metrics import Histogram, route_name
+from .utils import get_logger
+
+logger = get_logger("ddeutil.observe")
+
+# NOTE: The scope of the current request that the process time middleware
+#   sets, so a slow query can report the route that executes it.
+request_scope: ContextVar[Optional[dict[str, Any]]] = ContextVar(
+    "request_scope", default=None
+)
+
+
+@dataclass
+class QueryCounter:
+    """Number of the SQL statements and their total execution time in seconds
+    of one request.
+    """
+
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# NOTE: The query counter of the current request. It is a mutable object, so
+#   the tasks that copy the context of this request will count to it too.
+request_queries: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "request_queries", default=None
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the SQL statements that execute on this context."""
+    counter = QueryCounter()
+    token = request_queries.set(counter)
+    try:
+        yield counter
+    finally:
+        request_queries.reset(token)
+
+
+OTHER: str = "<other>"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES = re.compile(r"(\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize(statement: str) -> str:
+    """Return the shape of a SQL statement that replace the literal values
+    with ``?``, collapse the parameter lists like the IN list and the multi
+    rows VALUES clause, and collapse the white spaces.
+    """
+    shape: str = _SPACE.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?...)", shape)
+    return _VALUES.sub(r"\1", shape)
+
+
+class StatementStats:
+    """Statistic values of one statement shape."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.slow: int = 0
+        self.latency: Histogram = Histogram()
+
+    def observe(self, seconds: float, slow: bool) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.slow += slow
+        self.latency.observe(seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p95": self.latency.quantile(0.95),
+            "slow": self.slow,
+        }
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    statement: str
+    duration: float
+    route: Optional[str]
+    at: datetime = field(default_factory=datetime.now)
+
+
+class StatementProfiler:
+    """Profiler that aggregate the execution time of the SQL statements by
+    their shapes, and keep the latest slow queries with their routes.
+
+    This object does not use any lock because the async engine executes its
+    statements on the event loop thread only.
+
+    :param slow_threshold: A number of seconds that a statement is slow.
+    :param maxsize: A maximum number of statement shapes. The new shapes will
+        aggregate to the ``<other>`` shape when it is full.
+    :param slow_maxsize: A maximum number of the latest slow queries.
+    :param enabled: A flag that aggregate the statements. The query counter
+        of the request still works if it disables.
+    """
+
+    def __init__(
+        self,
+        slow_threshold: float = 0.1,
+        maxsize: int = 500,
+        slow_maxsize: int = 100,
+        enabled: bool = True,
+    ) -> None:
+        self.enabled: bool = enabled
+        self.slow_threshold: float = slow_threshold
+        self.maxsize: int = maxsize
+        self.statements: dict[str, StatementStats] = {}
+        self.slow_queries: deque[SlowQuery] = deque(maxlen=slow_maxsize)
+
+    def observe(self, statement: str, seconds: float) -> None:
+        shape: str = normalize(statement)
+        if (stats := self.statements.get(shape)) is None:
+            if len(self.statements) >= self.maxsize:
+                shape = OTHER
+            stats = self.statements.setdefault(shape, StatementStats())
+
+        slow: bool = seconds >= self.slow_threshold
+        stats.observe(seconds, slow)
+        if slow:
+            scope: Optional[dict[str, Any]] = request_scope.get()
+            route: Optional[str] = route_name(scope) if scope else None
+            self.slow_queries.append(
+                SlowQuery(statement=shape, duration=seconds, route=route)
+            )
+            logger.warning(
+                f"Slow query {seconds * 1000:.1f} ms on route {route}: "
+                f"{shape[:200]}"
+            )
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.slow_queries.clear()
+
+    def top(
+        self,
+        limit: int = 20,
+        order: Literal["total", "count", "max", "p95"] = "total",
+    ) -> list[dict[str, Any]]:
+        """Return the statistic values of the top statement shapes."""
+        rows: list[dict[str, Any]] = [
+            {"statement": shape, **stats.stats()}
+            for shape, stats in self.statements.items()
+        ]
+        rows.sort(key=lambda row: row[order], reverse=True)
+        return rows[:limit]
+
+    def listen(self, engine: type[Engine] | Engine = Engine) -> None:
+        """Listen the cursor execute events of an engine, or all engines."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            conn.info.setdefault("query_start_time", []).append(
+                time.perf_counter()
+            )
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            if not (starts := conn.info.get("query_start_time")):
+                return
+            seconds: float = time.perf_counter() - starts.pop(-1)
+            if (counter := request_queries.get()) is not None:
+                counter.queries += 1
+                counter.seconds += seconds
+            if self.enabled:
+                self.observe(statement, seconds)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            if context.connection is not None and (
+                starts := context.connection.info.get("query_start_time")
+            ):
+                starts.pop(-1)
+
+
+profiler = StatementProfiler(
+    slow_threshold=config.SQL_SLOW_QUERY_MS / 1000,
+    maxsize=config.SQL_PROFILER_MAXSIZE,
+    enabled=config.SQL_PROFILER,
+)
+profiler.listen(Engine)
@@ -0,0 +1,260 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""
+The rate limit of the incoming requests that enforce the rules of a tier from
+the rate limit table. The rules load from the database at the application
+startup, so the middleware does not touch the database on the hot path.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .auth.models import RateLimit, Tier
+from .cache import TTLCache
+from .conf import config
+from .utils import get_logger
+
+logger = get_logger("ddeutil.observe")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Rate limit rule that allow the limit number of requests per period in
+    seconds on a path pattern. A pattern that end with ``*`` will match with
+    its prefix.
+    """
+
+    name: str
+    path: str
+    limit: int
+    period: int
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+
+class PathMatcher:
+    """Compiled path matcher of the rate limit rules. It compiles all patterns
+    to one regular expression, where the exact pattern and the longer prefix
+    pattern have the higher priority.
+    """
+
+    def __init__(self, rules: list[Rule]) -> None:
+        self.rules: list[Rule] = sorted(
+            rules,
+            key=lambda r: (r.path.endswith("*"), -len(r.path.rstrip("*"))),
+        )
+        self.pattern: Optional[re.Pattern[str]] = None
+        if self.rules:
+            self.pattern = re.compile(
+                "|".join(
+                    f"(?P<r{i}>{self.compile(rule.path)})"
+                    for i, rule in enumerate(self.rules)
+                )
+            )
+
+    @staticmethod
+    def compile(path: str) -> str:
+        if path.endswith("*"):
+            return f"{re.escape(path.rstrip('*'))}.*"
+        return f"{re.escape(path)}$"
+
+    def match(self, path: str) -> Optional[Rule]:
+        """Return the rule that match with a path."""
+        if self.pattern is None or (m := self.pattern.match(path)) is None:
+            return None
+        return self.rules[int(m.lastgroup[1:])]
+
+
+class RateLimitBackend(ABC):
+    """Backend of the rate limit counters. It should implement with the shared
+    storage if the application runs on many processes.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, period: int) -> RateLimitResult:
+        """Count a request of a key and return the result of its limit."""
+
+
+class MemoryBackend(RateLimitBackend):
+    """In-process backend that use the sliding window counter. It keeps the
+    request count of the current and the previous fixed windows of each key,
+    and estimates the count of the sliding window from the weight of the
+    previous window.
+
+    :param maxsize: A maximum number of keys. The least recently used key will
+        evict when it is full.
+    :param timer: A clock function that use for testing.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100_000,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.timer: Callable[[], float] = timer
+        self.counters: TTLCache[str, list[float]] = TTLCache(
+            maxsize=maxsize, ttl=0, timer=timer
+        )
+
+    async def hit(self, key: str, limit: int, period: int) -> RateLimitResult:
+        now: float = self.timer()
+        window: float = now - (now % period)
+        if (counter := self.counters.get(key)) is None:
+            counter = [window, 0, 0]
+        elif counter[0] != window:
+            previous: int = counter[2] if counter[0] == window - period else 0
+            counter = [window, previous, 0]
+
+        elapsed: float = now - window
+        estimated: float = counter[1] * (1 - elapsed / period) + counter[2]
+        if estimated + 1 > limit:
+            self.counters.set(key, counter, ttl=period * 2)
+            return RateLimitResult(
+                allowed=False,
+                limit=limit,
+                remaining=0,
+                retry_after=period - elapsed,
+            )
+
+        counter[2] += 1
+        self.counters.set(key, counter, ttl=period * 2)
+        return RateLimitResult(
+            allowed=True,
+            limit=limit,
+            remaining=max(math.floor(limit - estimated - 1), 0),
+        )
+
+
+class RateLimiter:
+    """Rate limiter that keep the compiled rules and the counter backend."""
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None) -> None:
+        self.backend: RateLimitBackend = backend or MemoryBackend()
+        self.matcher: PathMatcher = PathMatcher([])
+
+    def set_rules(self, rules: list[Rule]) -> None:
+        self.matcher = PathMatcher(rules)
+
+    async def load(self, session: AsyncSession, tier: str) -> list[Rule]:
+        """Load the rules of a tier from the rate limit table."""
+        rules: list[Rule] = [
+            Rule(name=r.name, path=r.path, limit=r.limit, period=r.period)
+            for r in (
+                await session.execute(
+                    select(RateLimit)
+                    .join(Tier, Tier.id == RateLimit.tier_id)
+                    .where(Tier.name == tier, RateLimit.period > 0)
+                )
+            ).scalars()
+        ]
+        self.set_rules(rules)
+        logger.info(f"Load {len(rules)} rate limit rules of tier: {tier}")
+        return rules
+
+    async def hit(self, path: str, identity: str) -> Optional[RateLimitResult]:
+        """Count a request of an identity on a path and return its result. It
+        returns None if any rule does not match with this path.
+        """
+        if (rule := self.matcher.match(path)) is None:
+            return None
+        return await self.backend.hit(
+            f"{rule.name}:{identity}", rule.limit, rule.period
+        )
+
+
+limiter = RateLimiter(MemoryBackend(maxsize=config.RATELIMIT_MAXSIZE))
+
+
+class RateLimitMiddleware:
+    """Rate limit middleware that count the request of each user, or each
+    client host for the anonymous user, and respond 429 status if it reaches
+    the limit of the matched rule. It should add before the authentication
+    middleware, so it can get the user from the connection scope.
+
+    :param app: An ASGI application.
+    :param limiter: A rate limiter object.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter = limiter,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        result: Optional[RateLimitResult] = await self.limiter.hit(
+            scope["path"], self.identity(scope)
+        )
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers: dict[str, str] = {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+        }
+        if not result.allowed:
+            headers["Retry-After"] = str(math.ceil(result.retry_after))
+            response = JSONResponse(
+                {"detail": "Too Many Requests"},
+                status_code=429,
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [
+                    *message["headers"],
+                    *(
+                        (k.lower().encode(), v.encode())
+                        for k, v in headers.items()
+                    ),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def identity(scope: Scope) -> str:
+        """Return the identity of the connection that is the username of the
+        authenticated user or the client host.
+        """
+        if (user := scope.get("user")) is not None and user.is_authenticated:
+            return f"user:{user.identity}"
+        client = HTTPConnection(scope).client
+        return f"host:{client.host if client else 'unknown'}"
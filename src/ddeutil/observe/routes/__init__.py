@@ -5,8 +5,17 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
-from fastapi import APIRouter
+from typing import Any, Literal
 
+from fastapi import APIRouter, Depends, Query
+from fastapi import status as st
+from fastapi.responses import PlainTextResponse
+
+from ..auth.deps import get_current_super_user
+from ..db import sessionmanager
+from ..metrics import route_metrics
+from ..profiler import profiler
+from ..writer import writer
 from .workflow.routes import workflow as workflow_api
 from .workflow.views import workflow
 
@@ -17,3 +26,75 @@ api_router.include_router(workflow_api)
 @api_router.get("/", tags=["api"])
 async def health():
     return {"message": "Observe Application Standby ..."}
+
+
+@api_router.get(
+    "/metrics",
+    tags=["api"],
+    response_class=PlainTextResponse,
+    dependencies=[Depends(get_current_super_user)],
+)
+async def read_metrics():
+    """Return the latency histograms of each route and the in-flight requests
+    gauge with the Prometheus text exposition format.
+    """
+    return route_metrics.render()
+
+
+@api_router.get(
+    "/metrics/routes",
+    tags=["api"],
+    dependencies=[Depends(get_current_super_user)],
+)
+async def read_route_metrics() -> list[dict[str, Any]]:
+    """Return the latency statistic values of each route."""
+    return route_metrics.stats()
+
+
+@api_router.get(
+    "/metrics/db",
+    tags=["api"],
+    dependencies=[Depends(get_current_super_user)],
+)
+async def read_db_metrics() -> dict[str, Any]:
+    """Return the statistic values of the database connection pools and the
+    writer queue.
+    """
+    return {
+        "pool": sessionmanager.pool_stats(),
+        "read_pool": (
+            sessionmanager.pool_stats(read_only=True)
+            if sessionmanager.has_read_engine()
+            else None
+        ),
+        "writer": writer.stats(),
+    }
+
+
+@api_router.get(
+    "/metrics/sql",
+    tags=["api"],
+    dependencies=[Depends(get_current_super_user)],
+)
+async def read_sql_metrics(
+    limit: int = Query(default=20, ge=1, le=500),
+    order: Literal["total", "count", "max", "p95"] = "total",
+) -> dict[str, Any]:
+    """Return the top statement shapes of the SQL statement profiler and its
+    latest slow queries.
+    """
+    return {
+        "statements": profiler.top(limit=limit, order=order),
+        "slow_queries": list(profiler.slow_queries),
+    }
+
+
+@api_router.delete(
+    "/metrics/sql",
+    tags=["api"],
+    status_code=st.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(get_current_super_user)],
+)
+async def reset_sql_metrics():
+    """Reset the statistic values of the SQL statement profiler."""
+    profiler.reset()
@@ -5,17 +5,41 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import asyncio
 from collections.abc import AsyncIterator
 from datetime import datetime
+from functools import partial
+from typing import Any, Literal
 
-from sqlalchemy import select
+from sqlalchemy import (
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import false
 
 from ...crud import BaseCRUD
-from ...utils import get_logger
+from ...db import sessionmanager
+from ...utils import decode_cursor, encode_cursor, get_logger
+from ...writer import write
 from . import models as md
-from .schemas import ReleaseLogCreate, Workflow, WorkflowCreate
+from .schemas import (
+    LogCreate,
+    ReleaseLogCreate,
+    Workflow,
+    WorkflowCreate,
+    WorkflowPage,
+)
 
 logger = get_logger("ddeutil.observe")
 
@@ -34,7 +58,7 @@ async def get_workflow(
 async def get_workflow_by_name(
     session: AsyncSession,
     name: str,
-) -> md.Workflows:
+) -> md.Workflows | None:
     return (
         await session.execute(
             select(md.Workflows)
@@ -44,7 +68,7 @@ async def get_workflow_by_name(
             )
             .limit(1)
         )
-    ).first()
+    ).scalar_one_or_none()
 
 
 async def create_workflow(
@@ -69,18 +93,21 @@ async def create_workflow(
 
 async def list_workflows(
     session: AsyncSession,
-    skip: int = 0,
+    after_id: int | None = None,
     limit: int = 1000,
 ) -> list[md.Workflows]:
+    """Return workflows that does not delete and order by ID with the keyset
+    pagination.
+
+    :param session: An async session that use to execute the statement.
+    :param after_id: The last ID of the previous page.
+    :param limit: A maximum number of workflows that return.
+    """
+    stmt = select(md.Workflows).filter(md.Workflows.delete_flag == false())
+    if after_id is not None:
+        stmt = stmt.filter(md.Workflows.id > after_id)
     return (
-        (
-            await session.execute(
-                select(md.Workflows)
-                .filter(md.Workflows.delete_flag == false())
-                .offset(skip)
-                .limit(limit)
-            )
-        )
+        (await session.execute(stmt.order_by(md.Workflows.id).limit(limit)))
         .scalars()
         .all()
     )
@@ -89,19 +116,59 @@ async def list_workflows(
 async def search_workflow(
     session: AsyncSession,
     search_text: str,
+    skip: int = 0,
+    limit: int = 100,
 ) -> list[md.Workflows]:
-    if len(search_text) > 0:
-        if not (search_text := search_text.strip().lower()):
-            return []
+    """Search workflows that its name or description contain the search text
+    with one query on the database.
 
-        results = []
-        for workflow in await list_workflows(session=session):
-            text: str = f"{workflow.name} {workflow.desc or ''}".lower()
-            logger.debug(f"Getting text: {text} | Search {search_text}")
-            if search_text in text:
-                results.append(workflow)
-        return results
-    return await list_workflows(session=session)
+    On the SQLite backend, it will use the full-text search index with the
+    trigram tokenizer and order the result by its rank. It will fall back to
+    the LIKE condition if the backend is not SQLite or the search text is
+    shorter than 3 characters that the trigram tokenizer can not match.
+
+    :param session: An async session that use to execute the statement.
+    :param search_text: A search text.
+    :param skip: A number of workflows that skip before return.
+    :param limit: A maximum number of workflows that return.
+    """
+    stmt = select(md.Workflows).filter(md.Workflows.delete_flag == false())
+    if not (search_text := search_text.strip()):
+        stmt = stmt.order_by(md.Workflows.id)
+    elif session.bind.dialect.name == "sqlite" and len(search_text) >= 3:
+        fts = table(md.WORKFLOWS_FTS, column("rowid"), schema="main")
+        stmt = (
+            stmt.join(fts, fts.c.rowid == md.Workflows.id)
+            .filter(
+                literal_column(md.WORKFLOWS_FTS).op("MATCH")(
+                    # NOTE: Quote the search text to be a FTS5 string.
+                    '"'
+                    + search_text.replace('"', '""')
+                    + '"'
+                )
+            )
+            .order_by(literal_column("rank"), md.Workflows.id)
+        )
+    else:
+        pattern: str = (
+            "%"
+            + (
+                search_text.lower()
+                .replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            + "%"
+        )
+        stmt = stmt.filter(
+            or_(
+                func.lower(md.Workflows.name).like(pattern, escape="\\"),
+                func.lower(md.Workflows.desc).like(pattern, escape="\\"),
+            )
+        ).order_by(md.Workflows.id)
+    return (
+        (await session.execute(stmt.offset(skip).limit(limit))).scalars().all()
+    )
 
 
 async def get_release(
@@ -117,31 +184,251 @@ async def get_release(
     ).first()
 
 
-async def create_release_log(
+def _log_params(release_id: int, logs: list[LogCreate]) -> list[dict]:
+    return [
+        {"run_id": log.run_id, "context": log.context, "release_id": release_id}
+        for log in logs
+    ]
+
+
+async def create_release(
+    session: AsyncSession,
+    workflow_id: int,
+    release: int,
+) -> md.WorkflowReleases:
+    """Create a release row and flush it to get its surrogate key without
+    committing the current transaction.
+    """
+    db_release = md.WorkflowReleases(release=release, workflow_id=workflow_id)
+    session.add(db_release)
+    await session.flush()
+    return db_release
+
+
+async def create_logs(
+    session: AsyncSession,
+    release_id: int,
+    logs: list[LogCreate],
+) -> list[md.WorkflowLogs]:
+    """Insert logs of a release with one bulk INSERT statement that use
+    RETURNING and return the created log objects. This function does not
+    commit the current transaction.
+    """
+    if not logs:
+        return []
+    return (
+        await session.scalars(
+            insert(md.WorkflowLogs).returning(md.WorkflowLogs),
+            _log_params(release_id, logs),
+        )
+    ).all()
+
+
+async def upsert_summary(
+    session: AsyncSession,
+    workflow_id: int,
+    release: int,
+    last_log: LogCreate | None = None,
+) -> None:
+    """Add a new release to the summary of a workflow with one upsert statement
+    on the current transaction.
+
+    :param session: An async session that use to execute the statement.
+    :param workflow_id: A workflow ID.
+    :param release: A release value that was created.
+    :param last_log: The last log of this release if it exists.
+    """
+    upsert = (
+        postgresql.insert
+        if session.bind.dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    summary = md.WorkflowSummaries.__table__
+    values: dict[str, Any] = {
+        "workflow_id": workflow_id,
+        "latest_release": release,
+        "release_count": 1,
+    }
+    if last_log is not None:
+        values.update(log_summary(last_log))
+
+    stmt = upsert(summary).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[summary.c.workflow_id],
+        set_={
+            "latest_release": case(
+                (
+                    or_(
+                        summary.c.latest_release.is_(None),
+                        stmt.excluded.latest_release > summary.c.latest_release,
+                    ),
+                    stmt.excluded.latest_release,
+                ),
+                else_=summary.c.latest_release,
+            ),
+            "release_count": summary.c.release_count + 1,
+            **{
+                k: func.coalesce(stmt.excluded[k], summary.c[k])
+                for k in ("last_run_id", "last_run_status", "last_run_at")
+            },
+        },
+    )
+    await session.execute(stmt)
+
+
+async def update_summary_last_run(
+    session: AsyncSession,
+    workflow_id: int,
+    last_log: LogCreate,
+) -> None:
+    """Update the last run of the summary of a workflow on the current
+    transaction.
+    """
+    await session.execute(
+        update(md.WorkflowSummaries)
+        .where(md.WorkflowSummaries.workflow_id == workflow_id)
+        .values(log_summary(last_log))
+    )
+
+
+def log_summary(log: LogCreate) -> dict[str, Any]:
+    """Return the last run columns of the workflow summary from a log."""
+    status: Any = log.context.get("status")
+    return {
+        "last_run_id": log.run_id,
+        "last_run_status": str(status) if status is not None else None,
+        "last_run_at": datetime.now(),
+    }
+
+
+async def add_release_log(
     session: AsyncSession,
     workflow_id: int,
     release_log: ReleaseLogCreate,
-):
-    db_release = md.WorkflowReleases(
-        release=release_log.release,
+) -> md.WorkflowReleases:
+    """Add a release with all of its logs to the current transaction without
+    committing it.
+
+    The release row is flushed first to get its surrogate key, and then all
+    of the log rows are inserted with one bulk INSERT statement that use
+    RETURNING, so the number of round trips does not grow with the number of
+    logs. The returned release already has its ``logs`` relationship loaded.
+
+    :param session: An async session that use to execute the statements.
+    :param workflow_id: A workflow ID that this release belong to.
+    :param release_log: A release log data that want to create.
+    """
+    db_release = await create_release(
+        session, workflow_id=workflow_id, release=release_log.release
+    )
+    db_logs = await create_logs(
+        session, release_id=db_release.id, logs=release_log.logs
+    )
+    await upsert_summary(
+        session,
         workflow_id=workflow_id,
+        release=release_log.release,
+        last_log=(release_log.logs[-1] if release_log.logs else None),
+    )
+
+    # NOTE: Set the loaded logs to the release object without emitting any
+    #   lazy-load statement from the relationship attribute.
+    set_committed_value(db_release, "logs", db_logs)
+    return db_release
+
+
+async def create_release_log(
+    session: AsyncSession,
+    workflow_id: int,
+    release_log: ReleaseLogCreate,
+) -> md.WorkflowReleases:
+    """Create a release with all of its logs in a single transaction. It runs
+    on the writer queue if that queue is running.
+    """
+    return await write(
+        session,
+        partial(
+            add_release_log, workflow_id=workflow_id, release_log=release_log
+        ),
+    )
+
+
+async def create_release_log_stream(
+    session: AsyncSession,
+    workflow_id: int,
+    release: int,
+    logs: AsyncIterator[LogCreate],
+    chunk_size: int = 1000,
+) -> tuple[md.WorkflowReleases, int]:
+    """Create a release and stream its logs to the database in bounded chunks.
+
+    Every chunk is inserted and committed before the next chunk is read
+    from the incoming iterator, so the memory usage depends on the chunk size
+    only. The summary of the workflow is updated after the last chunk. If the
+    iterator or any statement raises, or the task is cancelled, the release
+    and the chunks that already committed will be deleted before re-raising,
+    so the client can retry the same release.
+
+    It does not run on the writer queue, because a slow client stream would
+    hold that queue until the whole body was received.
+
+    :param session: An async session that use to execute the statements.
+    :param workflow_id: A workflow ID that this release belong to.
+    :param release: A release value.
+    :param logs: An async iterator of log data that want to create.
+    :param chunk_size: A maximum number of logs that insert in one chunk.
+
+    :rtype: tuple[md.WorkflowReleases, int]
+    :return: A pair of the created release and the number of inserted logs.
+    """
+    db_release = await create_release(
+        session, workflow_id=workflow_id, release=release
     )
-    session.add(db_release)
-    await session.flush()
     await session.commit()
-    await session.refresh(db_release)
 
-    for log in release_log.logs:
-        db_log = md.WorkflowLogs(
-            run_id=log.run_id,
-            context=log.context,
-            release_id=db_release.id,
+    # NOTE: Keep the release ID before any rollback, because the rollback
+    #   expires the release object and its lazy load does not work on the
+    #   async session.
+    release_id: int = db_release.id
+    total: int = 0
+    chunk: list[LogCreate] = []
+    last_log: LogCreate | None = None
+    try:
+        async for log in logs:
+            chunk.append(log)
+            last_log = log
+            if len(chunk) >= chunk_size:
+                await session.execute(
+                    insert(md.WorkflowLogs), _log_params(release_id, chunk)
+                )
+                await session.commit()
+                total += len(chunk)
+                chunk = []
+
+        if chunk:
+            await session.execute(
+                insert(md.WorkflowLogs), _log_params(release_id, chunk)
+            )
+            total += len(chunk)
+        await upsert_summary(session, workflow_id=workflow_id, release=release)
+        if last_log is not None:
+            await update_summary_last_run(session, workflow_id, last_log)
+        await session.commit()
+    except (Exception, asyncio.CancelledError):
+        await session.rollback()
+        await session.execute(
+            delete(md.WorkflowLogs).where(
+                md.WorkflowLogs.release_id == release_id
+            )
+        )
+        await session.execute(
+            delete(md.WorkflowReleases).where(
+                md.WorkflowReleases.id == release_id
+            )
         )
-        session.add(db_log)
-        await session.flush()
         await session.commit()
-        await session.refresh(db_log)
-    return db_release
+        raise
+    return db_release, total
 
 
 async def get_log(session: AsyncSession, run_id: str) -> md.WorkflowLogs:
@@ -158,13 +445,65 @@ class WorkflowsCRUD(BaseCRUD):
 
     async def get_all(
         self,
-        skip: int = 0,
-        limit: int = 100,
+        after_id: int | None = None,
+        limit: int | None = 100,
+        partition: int | None = None,
     ) -> AsyncIterator[Workflow]:
         async for wf in md.Workflows.get_all(
             self.async_session,
-            skip=skip,
+            after_id=after_id,
             limit=limit,
-            include_release=True,
+            partition=partition,
         ):
             yield Workflow.model_validate(wf)
+
+    async def get_page(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> WorkflowPage:
+        """Return a page of workflows with the opaque cursor of the next page.
+        It raises ValueError if the cursor does not valid.
+
+        :param cursor: A cursor from the previous page.
+        :param limit: A maximum number of workflows that return.
+        """
+        after_id: int | None = decode_cursor(cursor) if cursor else None
+
+        # NOTE: Fetch one more row for checking the next page exists.
+        items: list[Workflow] = [
+            wf async for wf in self.get_all(after_id=after_id, limit=limit + 1)
+        ]
+        if len(items) > limit:
+            items = items[:limit]
+            return WorkflowPage(
+                items=items, next_cursor=encode_cursor(items[-1].id)
+            )
+        return WorkflowPage(items=items)
+
+
+async def stream_workflows(
+    partition: int = 500,
+    fmt: Literal["json", "ndjson"] = "ndjson",
+) -> AsyncIterator[bytes]:
+    """Stream all workflows as a JSON array or newline-delimited JSON bytes
+    chunks. The peak memory depends on the partition size only.
+
+    This function opens its own session because the session from the
+    dependency will close before the streaming response start sending.
+
+    :param partition: A number of rows that fetch from the cursor at a time.
+    :param fmt: A format of the output, ``json`` or ``ndjson``.
+    """
+    async with sessionmanager.session(read_only=True) as session:
+        service = WorkflowsCRUD(session)
+        if fmt == "ndjson":
+            async for wf in service.get_all(limit=None, partition=partition):
+                yield wf.model_dump_json().encode() + b"\n"
+            return
+
+        sep: bytes = b"["
+        async for wf in service.get_all(limit=None, partition=partition):
+            yield sep + wf.model_dump_json().encode()
+            sep = b","
+        yield b"]" if sep == b"," else b"[]"
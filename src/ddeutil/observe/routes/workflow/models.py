@@ -6,9 +6,11 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, event, func, insert, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, relationship, selectinload
 from sqlalchemy.sql.expression import select
@@ -21,7 +23,8 @@ from sqlalchemy.types import (
 )
 from typing_extensions import Self
 
-from ...db import Base, Col
+from ...conf import config
+from ...db import Base, Col, CompressedJSON
 
 
 class Workflows(Base):
@@ -42,26 +45,105 @@ class Workflows(Base):
         back_populates="workflow",
     )
 
+    # NOTE: The summary is one narrow row per workflow, so it will load with
+    #   the workflow by a joined eager loading.
+    summary: Mapped[Optional[WorkflowSummaries]] = relationship(
+        "WorkflowSummaries",
+        back_populates="workflow",
+        uselist=False,
+        lazy="joined",
+    )
+
     @classmethod
     async def get_all(
         cls,
         session: AsyncSession,
-        skip: int = 0,
-        limit: int = 100,
+        after_id: int | None = None,
+        limit: int | None = 100,
         include_release: bool = False,
+        partition: int | None = None,
     ) -> AsyncIterator[Self]:
+        """Return workflows that order by ID with the keyset pagination, so
+        the cost of a deep page does not depend on its position.
+
+        The rows are fetched from a server-side cursor, so if the partition
+        value was set, it will keep only that number of rows in memory at a
+        time.
+
+        :param session: An async session that use to execute the statement.
+        :param after_id: The last ID of the previous page.
+        :param limit: A maximum number of workflows that return. If it is None,
+            it will return all workflows after the ``after_id`` value.
+        :param include_release: If True, it will load the releases together.
+        :param partition: A number of rows that fetch from the cursor at a time.
+        """
         stmt = select(cls)
         if include_release:
             stmt = stmt.options(selectinload(cls.releases))
-        if skip > 0 and limit > 0:
-            stmt = stmt.offset(skip).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(cls.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if partition is not None:
+            stmt = stmt.execution_options(yield_per=partition)
 
         async for row in (
-            (await session.stream(stmt.order_by(cls.id))).scalars().all()
-        ):
+            await session.stream(stmt.order_by(cls.id))
+        ).scalars():
             yield row
 
 
+class WorkflowSummaries(Base):
+    """Denormalized summary of the releases of a workflow that update in the
+    same transaction that create a release, so the listing pages do not need
+    to read the releases and logs tables.
+    """
+
+    __tablename__ = "workflow_summaries"
+
+    workflow_id: Mapped[int] = Col(
+        Integer, ForeignKey("workflows.id"), primary_key=True
+    )
+    latest_release: Mapped[Optional[int]] = Col(Integer, nullable=True)
+    release_count: Mapped[int] = Col(Integer, default=0, nullable=False)
+    last_run_id: Mapped[Optional[str]] = Col(String, nullable=True)
+    last_run_status: Mapped[Optional[str]] = Col(String, nullable=True)
+    last_run_at: Mapped[Optional[datetime]] = Col(DateTime, nullable=True)
+
+    workflow: Mapped[Workflows] = relationship(
+        "Workflows", back_populates="summary"
+    )
+
+
+@event.listens_for(WorkflowSummaries.__table__, "after_create")
+def mark_summary_backfill(_, connection: Connection, **kwargs) -> None:
+    """Mark the summary table was created on this connection, so the summary
+    of the existing releases will backfill after all tables created.
+    """
+    connection.info["backfill_summary"] = True
+
+
+@event.listens_for(Base.metadata, "after_create")
+def backfill_summary(_, connection: Connection, **kwargs) -> None:
+    """Backfill the summary from the existing releases when the summary table
+    was created on the database that already has releases.
+    """
+    if not connection.info.pop("backfill_summary", False):
+        return
+
+    releases = WorkflowReleases.__table__
+    connection.execute(
+        insert(WorkflowSummaries).from_select(
+            ["workflow_id", "latest_release", "release_count"],
+            select(
+                releases.c.workflow_id,
+                func.max(releases.c.release),
+                func.count(),
+            ).group_by(releases.c.workflow_id),
+        )
+    )
+
+
 class WorkflowReleases(Base):
     __tablename__ = "workflow_releases"
 
@@ -78,14 +160,108 @@ class WorkflowReleases(Base):
     )
 
 
+# NOTE: The shared dictionary of the workflow log context compression that
+#   keeps the common keys and values of the workflow run context. The most
+#   common one should be at the end of this dictionary.
+#
+#   Do not change this value after the compressed logs were written. If it
+#   changes, the old value should pass to the ``old_zdicts`` argument.
+#
+WORKFLOW_LOG_ZDICT: bytes = (
+    b'"skipped","failed","success","error":null,"errors":{},'
+    b'"execution_time":0.0,"status":0,"status":1,"outputs":{"records":'
+    b'"asat-dt":"2024-09-02 09:36:00+07:00","update":"2024-09-02 09:36:00.0",'
+    b'"on":"*/3 * * * *","on":"* * * * *","release":"2024-09-02 09:36:00+07:00",'
+    b'"parent_run_id":"","run_id":"","name":"wf-","context":{"params":{'
+    b'"jobs":{"matrix":{},"strategy":{},"stages":{"outputs":{}},"'
+)
+
+
 class WorkflowLogs(Base):
     __tablename__ = "workflow_logs"
 
     run_id: Mapped[str] = Col(String, primary_key=True, index=True)
-    context: Mapped[dict] = Col(JSON)
-    release_id: Mapped[int] = Col(Integer, ForeignKey("workflow_releases.id"))
+    context: Mapped[dict] = Col(
+        (
+            CompressedJSON(zdict=WORKFLOW_LOG_ZDICT)
+            if config.WORKFLOW_LOG_COMPRESS
+            else JSON
+        ),
+    )
+    release_id: Mapped[int] = Col(
+        Integer, ForeignKey("workflow_releases.id"), index=True
+    )
 
     release: Mapped[WorkflowReleases] = relationship(
         "WorkflowReleases",
         back_populates="logs",
     )
+
+
+# NOTE: The full-text search index of the workflows table that only create on
+#   the SQLite backend. It uses the external content table, so it keeps only
+#   the index, and the trigram tokenizer that make the match work like the
+#   substring search. The triggers keep this index sync with the workflows
+#   table on insert, update, and delete.
+#
+#   Read more: https://www.sqlite.org/fts5.html#external_content_tables
+#
+WORKFLOWS_FTS: str = "workflows_fts"
+WORKFLOWS_FTS_DDL: tuple[str, ...] = (
+    (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS main.{WORKFLOWS_FTS} USING fts5("
+        f"name, \"desc\", content='workflows', content_rowid='id', "
+        f"tokenize='trigram')"
+    ),
+    (
+        f"CREATE TRIGGER IF NOT EXISTS main.{WORKFLOWS_FTS}_ai "
+        f"AFTER INSERT ON workflows BEGIN "
+        f'INSERT INTO {WORKFLOWS_FTS}(rowid, name, "desc") '
+        f'VALUES (new.id, new.name, new."desc"); END'
+    ),
+    (
+        f"CREATE TRIGGER IF NOT EXISTS main.{WORKFLOWS_FTS}_ad "
+        f"AFTER DELETE ON workflows BEGIN "
+        f'INSERT INTO {WORKFLOWS_FTS}({WORKFLOWS_FTS}, rowid, name, "desc") '
+        f"VALUES ('delete', old.id, old.name, old.\"desc\"); END"
+    ),
+    (
+        f"CREATE TRIGGER IF NOT EXISTS main.{WORKFLOWS_FTS}_au "
+        f'AFTER UPDATE OF name, "desc" ON workflows BEGIN '
+        f'INSERT INTO {WORKFLOWS_FTS}({WORKFLOWS_FTS}, rowid, name, "desc") '
+        f"VALUES ('delete', old.id, old.name, old.\"desc\"); "
+        f'INSERT INTO {WORKFLOWS_FTS}(rowid, name, "desc") '
+        f'VALUES (new.id, new.name, new."desc"); END'
+    ),
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(_, connection: Connection, **kwargs) -> None:
+    """Create the full-text search index of the workflows table if it does not
+    exist, and rebuild it from the existing rows.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    exists = connection.execute(
+        text(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = :name"
+        ),
+        {"name": WORKFLOWS_FTS},
+    ).first()
+    if exists:
+        return
+
+    for ddl in WORKFLOWS_FTS_DDL:
+        connection.exec_driver_sql(ddl)
+    connection.exec_driver_sql(
+        f"INSERT INTO main.{WORKFLOWS_FTS}({WORKFLOWS_FTS}) VALUES ('rebuild')"
+    )
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def drop_search_index(_, connection: Connection, **kwargs) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS main.{WORKFLOWS_FTS}")
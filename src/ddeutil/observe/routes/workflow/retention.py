@@ -0,0 +1,306 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""
+The retention job of the workflow releases and logs. It deletes the releases
+that do not match with the retention policy in bounded batches, where each
+batch is its own short transaction, so the ingestion does not wait for the
+write lock for long. After that it returns the free pages to the file system
+and checkpoints the WAL file on the SQLite backend.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, func, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...conf import config
+from ...db import sessionmanager
+from ...utils import get_logger
+from . import models as md
+from .crud import log_summary
+from .schemas import LogCreate
+
+logger = get_logger("ddeutil.observe")
+
+
+class RetentionResult(BaseModel):
+    """Result of one retention run."""
+
+    releases_deleted: int = 0
+    logs_deleted: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    # NOTE: False if the database does not use the incremental auto vacuum
+    #   mode, so the free pages do not return to the file system.
+    incremental_vacuum: bool = False
+    duration: float = 0.0
+    start_at: datetime = Field(default_factory=datetime.now)
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return max(self.bytes_before - self.bytes_after, 0)
+
+
+class RetentionMetrics(BaseModel):
+    """Accumulated metrics of the retention runs on this process."""
+
+    runs: int = 0
+    releases_deleted: int = 0
+    logs_deleted: int = 0
+    bytes_reclaimed: int = 0
+    last: Optional[RetentionResult] = None
+
+    def add(self, result: RetentionResult) -> None:
+        self.runs += 1
+        self.releases_deleted += result.releases_deleted
+        self.logs_deleted += result.logs_deleted
+        self.bytes_reclaimed += result.bytes_reclaimed
+        self.last = result
+
+
+metrics = RetentionMetrics()
+
+
+def release_before(days: int, now: Optional[datetime] = None) -> int:
+    """Return the release value of the cutoff datetime. The release value
+    use the ``%Y%m%d%H%M%S`` format as an integer.
+    """
+    cutoff: datetime = (now or datetime.now()) - timedelta(days=days)
+    return int(cutoff.strftime("%Y%m%d%H%M%S"))
+
+
+def expired_releases(
+    keep_releases: int = 0,
+    keep_days: int = 0,
+    limit: int = 500,
+):
+    """Return the select statement of the release IDs and their workflow IDs
+    that do not match with the retention policy.
+    """
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=md.WorkflowReleases.workflow_id,
+            order_by=md.WorkflowReleases.release.desc(),
+        )
+        .label("rank")
+    )
+    ranked = select(
+        md.WorkflowReleases.id,
+        md.WorkflowReleases.workflow_id,
+        md.WorkflowReleases.release,
+        rank,
+    ).subquery()
+
+    conditions = []
+    if keep_releases > 0:
+        conditions.append(ranked.c.rank > keep_releases)
+    if keep_days > 0:
+        conditions.append(ranked.c.release < release_before(keep_days))
+    return (
+        select(ranked.c.id, ranked.c.workflow_id)
+        .where(or_(*conditions))
+        .limit(limit)
+    )
+
+
+async def database_size(session: AsyncSession) -> int:
+    """Return the size in bytes of the SQLite database file that exclude its
+    free pages. It returns zero on other backends.
+    """
+    if session.bind.dialect.name != "sqlite":
+        return 0
+    page_size: int = (await session.execute(text("PRAGMA page_size"))).scalar()
+    page_count: int = (
+        await session.execute(text("PRAGMA page_count"))
+    ).scalar()
+    freelist_count: int = (
+        await session.execute(text("PRAGMA freelist_count"))
+    ).scalar()
+    return page_size * (page_count - freelist_count)
+
+
+async def refresh_summaries(
+    session: AsyncSession,
+    workflow_ids: set[int],
+) -> None:
+    """Recompute the summaries of the workflows from their remaining releases
+    on the current transaction. The last run columns are recomputed from the
+    last log of the latest remaining release if the latest release was
+    deleted, or set to NULL if there is not any remaining release.
+    """
+    for workflow_id in workflow_ids:
+        count, latest = (
+            await session.execute(
+                select(
+                    func.count(), func.max(md.WorkflowReleases.release)
+                ).where(md.WorkflowReleases.workflow_id == workflow_id)
+            )
+        ).one()
+        values: dict[str, Any] = {
+            "release_count": count,
+            "latest_release": latest,
+        }
+        current: Optional[int] = await session.scalar(
+            select(md.WorkflowSummaries.latest_release).where(
+                md.WorkflowSummaries.workflow_id == workflow_id
+            )
+        )
+        if current != latest:
+            values.update(
+                last_run_id=None, last_run_status=None, last_run_at=None
+            )
+        if current != latest and latest is not None:
+            log = (
+                await session.execute(
+                    select(md.WorkflowLogs.run_id, md.WorkflowLogs.context)
+                    .join(md.WorkflowReleases)
+                    .where(
+                        md.WorkflowReleases.workflow_id == workflow_id,
+                        md.WorkflowReleases.release == latest,
+                    )
+                    .order_by(md.WorkflowLogs.run_id.desc())
+                    .limit(1)
+                )
+            ).first()
+            if log is not None:
+                values.update(
+                    log_summary(
+                        LogCreate(run_id=log.run_id, context=log.context)
+                    )
+                )
+
+                # NOTE: The log does not keep its ingest datetime, so it uses
+                #   the release datetime instead.
+                values["last_run_at"] = datetime.strptime(
+                    str(latest), "%Y%m%d%H%M%S"
+                )
+
+        await session.execute(
+            update(md.WorkflowSummaries)
+            .where(md.WorkflowSummaries.workflow_id == workflow_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def compact(session: AsyncSession) -> bool:
+    """Return the free pages to the file system if the database use the
+    incremental auto vacuum mode, and checkpoint the WAL file. It returns
+    False if the free pages were not returned.
+    """
+    if session.bind.dialect.name != "sqlite":
+        return False
+
+    # NOTE: The auto vacuum value, 2, is the incremental mode.
+    vacuumed: bool = (
+        await session.execute(text("PRAGMA auto_vacuum"))
+    ).scalar() == 2
+    if vacuumed:
+        await session.execute(text("PRAGMA incremental_vacuum"))
+    else:
+        logger.warning(
+            "The database does not use the incremental auto vacuum mode, so "
+            "the free pages will reuse but do not return to the file system. "
+            "Run `PRAGMA auto_vacuum = INCREMENTAL` and then `VACUUM` once "
+            "to switch the mode."
+        )
+    await session.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    return vacuumed
+
+
+async def apply_retention(
+    keep_releases: int = 0,
+    keep_days: int = 0,
+    batch_size: int = 500,
+) -> RetentionResult:
+    """Delete the releases and their logs that do not match with the retention
+    policy in bounded batches, and compact the database after that.
+
+    :param keep_releases: A number of the latest releases of each workflow that
+        keep. Zero disables this rule.
+    :param keep_days: A number of days of releases that keep. Zero disables
+        this rule.
+    :param batch_size: A maximum number of rows that delete in one transaction.
+    """
+    result = RetentionResult()
+    start: float = time.perf_counter()
+    if keep_releases <= 0 and keep_days <= 0:
+        return result
+
+    async with sessionmanager.session() as session:
+        result.bytes_before = await database_size(session)
+
+        while rows := (
+            await session.execute(
+                expired_releases(keep_releases, keep_days, limit=batch_size)
+            )
+        ).all():
+            release_ids: list[int] = [row.id for row in rows]
+
+            # NOTE: Delete logs with the bounded batches before its releases.
+            while True:
+                rs = await session.execute(
+                    delete(md.WorkflowLogs)
+                    .where(
+                        md.WorkflowLogs.run_id.in_(
+                            select(md.WorkflowLogs.run_id)
+                            .where(md.WorkflowLogs.release_id.in_(release_ids))
+                            .limit(batch_size)
+                        )
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+                result.logs_deleted += rs.rowcount
+                if rs.rowcount < batch_size:
+                    break
+                await asyncio.sleep(0)
+
+            await session.execute(
+                delete(md.WorkflowReleases)
+                .where(md.WorkflowReleases.id.in_(release_ids))
+                .execution_options(synchronize_session=False)
+            )
+            await refresh_summaries(session, {row.workflow_id for row in rows})
+            await session.commit()
+            result.releases_deleted += len(release_ids)
+            await asyncio.sleep(0)
+
+        result.incremental_vacuum = await compact(session)
+        result.bytes_after = await database_size(session)
+
+    result.duration = time.perf_counter() - start
+    metrics.add(result)
+    logger.info(
+        f"Retention deleted {result.releases_deleted} releases and "
+        f"{result.logs_deleted} logs, reclaimed {result.bytes_reclaimed} "
+        f"bytes in {result.duration:.3f} sec."
+    )
+    return result
+
+
+async def retention_forever(interval: int) -> None:
+    """Run the retention job with the policy from the config object every
+    interval seconds until this task was cancelled.
+    """
+    while True:
+        try:
+            await apply_retention(
+                keep_releases=config.WORKFLOW_RETENTION_KEEP_RELEASES,
+                keep_days=config.WORKFLOW_RETENTION_KEEP_DAYS,
+                batch_size=config.WORKFLOW_RETENTION_BATCH_SIZE,
+            )
+        except Exception as err:
+            logger.exception(f"Retention job was failed: {err}")
+        await asyncio.sleep(interval)
@@ -5,18 +5,39 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from collections.abc import AsyncIterator
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi import status as st
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...auth.deps import get_current_super_user
+from ...conf import config
 from ...deps import get_async_session
+from ...utils import iter_lines
+from . import retention
 from .crud import (
     WorkflowsCRUD,
     create_release_log,
-    create_workflow,
+    create_release_log_stream,
     get_workflow_by_name,
+    stream_workflows,
+)
+from .crud import create_workflow as create_workflow_db
+from .retention import RetentionMetrics, RetentionResult
+from .schemas import (
+    LogCreate,
+    ReleaseLog,
+    ReleaseLogCreate,
+    ReleaseLogStream,
+    Workflow,
+    WorkflowCreate,
+    WorkflowPage,
 )
-from .schemas import ReleaseLog, ReleaseLogCreate, Workflow, WorkflowCreate
 
 workflow = APIRouter(
     prefix="/workflow",
@@ -25,13 +46,48 @@ workflow = APIRouter(
 )
 
 
-@workflow.get("/", response_model=list[Workflow])
+@workflow.get("/", response_model=WorkflowPage)
 async def read_all(
-    skip: int = 0,
-    limit: int = 100,
-    service: WorkflowsCRUD = Depends(WorkflowsCRUD),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    service: WorkflowsCRUD = Depends(WorkflowsCRUD.read_only),
 ):
-    return [wf async for wf in service.get_all(skip=skip, limit=limit)]
+    """Return a page of workflows. The ``next_cursor`` value of the response
+    use to get the next page.
+    """
+    try:
+        return await service.get_page(cursor=cursor, limit=limit)
+    except ValueError as err:
+        raise HTTPException(
+            status_code=st.HTTP_400_BAD_REQUEST,
+            detail=str(err),
+        ) from err
+
+
+@workflow.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={
+        st.HTTP_200_OK: {
+            "content": {
+                "application/x-ndjson": {},
+                "application/json": {},
+            },
+        },
+    },
+)
+async def read_all_stream(
+    fmt: Literal["json", "ndjson"] = Query(default="ndjson", alias="format"),
+):
+    """Stream all workflows as newline-delimited JSON or a JSON array without
+    loading the whole catalog to memory.
+    """
+    return StreamingResponse(
+        stream_workflows(partition=config.WORKFLOW_STREAM_PARTITION, fmt=fmt),
+        media_type=(
+            "application/x-ndjson" if fmt == "ndjson" else "application/json"
+        ),
+    )
 
 
 @workflow.post("/", response_model=Workflow)
@@ -45,7 +101,7 @@ async def create_workflow(
             status_code=st.HTTP_302_FOUND,
             detail="Workflow already registered in observe database.",
         )
-    return await create_workflow(session=session, workflow=wf)
+    return await create_workflow_db(session=session, workflow=wf)
 
 
 @workflow.post("/{name}/release", response_model=ReleaseLog)
@@ -65,3 +121,106 @@ async def create_workflow_release(
         workflow_id=db_workflow.id,
         release_log=rl,
     )
+
+
+@workflow.post(
+    "/{name}/release/stream",
+    response_model=ReleaseLogStream,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+            "required": True,
+        },
+    },
+)
+async def create_workflow_release_stream(
+    name: str,
+    release: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Create a release and its logs from a newline-delimited JSON body that
+    has one log object per line. The logs are validated while the body is
+    receiving and write to the database in bounded chunks.
+    """
+    content_type: str = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() != "application/x-ndjson":
+        raise HTTPException(
+            status_code=st.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content type should be application/x-ndjson.",
+        )
+
+    db_workflow = await get_workflow_by_name(session, name=name)
+    if not db_workflow:
+        raise HTTPException(
+            status_code=st.HTTP_302_FOUND,
+            detail="Workflow does not registered in observe database.",
+        )
+
+    async def parse_logs() -> AsyncIterator[LogCreate]:
+        lineno: int = 0
+        lines: AsyncIterator[bytes] = iter_lines(
+            request.stream(), max_line=config.WORKFLOW_INGEST_MAX_LINE
+        )
+        while True:
+            try:
+                line: bytes = await lines.__anext__()
+            except StopAsyncIteration:
+                return
+            except ValueError as err:
+                raise HTTPException(
+                    status_code=st.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Line {lineno + 1}: {err}",
+                ) from err
+            lineno += 1
+            try:
+                yield LogCreate.model_validate_json(line)
+            except ValidationError as err:
+                raise HTTPException(
+                    status_code=st.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Line {lineno}: {err.errors()}",
+                ) from err
+
+    try:
+        db_release, count = await create_release_log_stream(
+            session=session,
+            workflow_id=db_workflow.id,
+            release=release,
+            logs=parse_logs(),
+            chunk_size=config.WORKFLOW_INGEST_CHUNK_SIZE,
+        )
+    except IntegrityError as err:
+        raise HTTPException(
+            status_code=st.HTTP_409_CONFLICT,
+            detail="Log run ID already exists in observe database.",
+        ) from err
+    return ReleaseLogStream(
+        id=db_release.id,
+        release=db_release.release,
+        workflow_id=db_release.workflow_id,
+        count=count,
+    )
+
+
+@workflow.get(
+    "/retention",
+    response_model=RetentionMetrics,
+    dependencies=[Depends(get_current_super_user)],
+)
+async def read_retention():
+    """Return the metrics of the retention job on this process."""
+    return retention.metrics
+
+
+@workflow.post(
+    "/retention",
+    response_model=RetentionResult,
+    dependencies=[Depends(get_current_super_user)],
+)
+async def run_retention():
+    """Run the retention job with the configured policy now."""
+    return await retention.apply_retention(
+        keep_releases=config.WORKFLOW_RETENTION_KEEP_RELEASES,
+        keep_days=config.WORKFLOW_RETENTION_KEEP_DAYS,
+        batch_size=config.WORKFLOW_RETENTION_BATCH_SIZE,
+    )
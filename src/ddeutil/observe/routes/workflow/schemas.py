@@ -34,9 +34,34 @@ class Workflow(WorkflowBase):
     valid_end: datetime
 
 
+class WorkflowPage(BaseModel):
+    """Page of workflows with an opaque cursor of the next page. The next
+    cursor will be None if it is the last page.
+    """
+
+    items: list[Workflow]
+    next_cursor: Optional[str] = None
+
+
+class WorkflowSummary(BaseModel):
+    """Workflow summary Pydantic model that receive the WorkflowSummaries model
+    object from SQLAlchemy ORM.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    latest_release: Optional[int] = None
+    release_count: int = 0
+    last_run_id: Optional[str] = None
+    last_run_status: Optional[str] = None
+    last_run_at: Optional[datetime] = None
+
+
 class WorkflowView(Workflow):
     model_config = ConfigDict(from_attributes=True)
 
+    summary: Optional[WorkflowSummary] = None
+
     def gen_row(self) -> str:
         """Return a html row value that already map this model attributes.
 
@@ -97,3 +122,11 @@ class ReleaseLog(ReleaseBase):
 
     logs: list[Log]
     workflow_id: int
+
+
+class ReleaseLogStream(Release):
+    """Release Pydantic model that return after streaming its logs to the
+    observe database.
+    """
+
+    count: int
@@ -7,13 +7,14 @@ from __future__ import annotations
 
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Header, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi import status as st
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...auth.deps import required_current_active_user
-from ...deps import get_async_session, get_templates
-from ...utils import get_logger
+from ...deps import get_async_read_session, get_templates
+from ...utils import decode_cursor, encode_cursor, get_logger
 from . import crud
 from .schemas import (
     WorkflowView,
@@ -33,19 +34,37 @@ workflow = APIRouter(
 @workflow.get("/")
 async def read_workflows(
     request: Request,
-    session: AsyncSession = Depends(get_async_session),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_async_read_session),
     templates: Jinja2Templates = Depends(get_templates),
 ):
-    """Return all workflows."""
+    """Return a page of workflows with the keyset pagination."""
+    try:
+        after_id: Optional[int] = decode_cursor(cursor) if cursor else None
+    except ValueError as err:
+        raise HTTPException(
+            status_code=st.HTTP_400_BAD_REQUEST,
+            detail=str(err),
+        ) from err
+
+    # NOTE: Fetch one more row for checking the next page exists.
     workflows: list[WorkflowView] = WorkflowViews.validate_python(
-        await crud.list_workflows(session)
+        await crud.list_workflows(session, after_id=after_id, limit=limit + 1)
     )
+    next_cursor: Optional[str] = None
+    if len(workflows) > limit:
+        workflows = workflows[:limit]
+        next_cursor = encode_cursor(workflows[-1].id)
+
     return templates.TemplateResponse(
         request=request,
         name="workflow/workflow.html",
         context={
             "workflows": workflows,
             "search_text": "",
+            "next_cursor": next_cursor,
+            "limit": limit,
         },
     )
 
@@ -54,12 +73,20 @@ async def read_workflows(
 async def search_workflows(
     request: Request,
     search_text: str,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
     hx_request: Annotated[Optional[str], Header(...)] = None,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_read_session),
     templates: Jinja2Templates = Depends(get_templates),
 ):
+    """Return workflows that match with the search text."""
     workflows: list[WorkflowView] = WorkflowViews.validate_python(
-        await crud.search_workflow(session=session, search_text=search_text)
+        await crud.search_workflow(
+            session=session,
+            search_text=search_text,
+            skip=skip,
+            limit=limit,
+        )
     )
     if hx_request:
         return templates.TemplateResponse(
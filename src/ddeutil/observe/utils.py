@@ -5,7 +5,11 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 import logging
+from collections.abc import AsyncIterator
 from functools import lru_cache
 
 from .conf import config
@@ -32,3 +36,67 @@ def get_logger(name: str) -> logging.Logger:  # no cov
     logger.addHandler(stream)
     logger.setLevel(logging.DEBUG if config.LOG_DEBUG_MODE else logging.INFO)
     return logger
+
+
+async def iter_lines(
+    stream: AsyncIterator[bytes],
+    max_line: int = 1_048_576,
+) -> AsyncIterator[bytes]:
+    """Split an async stream of bytes chunks to lines without keeping more than
+    one incomplete line in memory. An empty line will be skipped. It raises
+    ValueError if a line is longer than the maximum size.
+
+    :param stream: An async iterator of bytes chunks such as ``request.stream()``
+    :param max_line: A maximum number of bytes of one line.
+    """
+    pending: list[bytes] = []
+    size: int = 0
+    async for chunk in stream:
+        *lines, rest = chunk.split(b"\n")
+        if lines:
+            lines[0] = b"".join(pending) + lines[0]
+            pending, size = [], 0
+        for line in lines:
+            if len(line) > max_line:
+                raise ValueError(f"Line is longer than {max_line} bytes.")
+            if line := line.strip():
+                yield line
+
+        # NOTE: Keep the incomplete line as the list of its parts, so it does
+        #   not copy the whole line on every chunk.
+        size += len(rest)
+        if size > max_line:
+            raise ValueError(f"Line is longer than {max_line} bytes.")
+        pending.append(rest)
+    if line := b"".join(pending).strip():
+        yield line
+
+
+def encode_cursor(last_id: int) -> str:
+    """Return an opaque pagination cursor string from the last ID of a page.
+
+    :param last_id: The last ID of the current page.
+    """
+    return (
+        base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode())
+        .rstrip(b"=")
+        .decode()
+    )
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the last ID from an opaque pagination cursor string. It raises
+    ValueError if the cursor is not valid.
+
+    :param cursor: A cursor string that create from ``encode_cursor``.
+    """
+    try:
+        data = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as err:
+        raise ValueError(f"Cursor {cursor!r} does not valid.") from err
+
+    if not isinstance(data, dict) or not isinstance(data.get("id"), int):
+        raise ValueError(f"Cursor {cursor!r} does not valid.")
+    return data["id"]
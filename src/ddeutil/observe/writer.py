@@ -0,0 +1,222 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""
+The single writer queue of the write operations. SQLite allows one writer at
+a time, so the concurrent write transactions wait for its lock with the busy
+timeout and make the long tail latency on the bursty ingest. This queue lets
+one task drain the write operations and run them together in one transaction,
+and it resolves the future of each caller after that transaction commits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .conf import config
+from .db import DBSessionManager, sessionmanager
+from .metrics import Histogram
+from .profiler import QueryCounter, request_queries
+from .utils import get_logger
+
+logger = get_logger("ddeutil.observe")
+
+T = TypeVar("T")
+
+# NOTE: A write operation gets the session of its batch and it should not
+#   commit that session, because the queue will commit all operations of the
+#   batch together. It can run again with a new session if the other
+#   operation on the same batch fails.
+WriteOp = Callable[[AsyncSession], Awaitable[T]]
+
+
+@dataclass
+class WriteItem:
+    op: WriteOp
+    future: asyncio.Future
+    queued_at: float = field(default_factory=time.perf_counter)
+
+    # NOTE: The query counter of the request that submits this operation, so
+    #   its statements count to that request even it runs on the writer task.
+    queries: Optional[QueryCounter] = None
+
+    async def run(self, session: AsyncSession) -> Any:
+        token = request_queries.set(self.queries)
+        try:
+            return await self.op(session)
+        finally:
+            request_queries.reset(token)
+
+
+class WriteQueue:
+    """Single writer queue that drain the write operations, run them together
+    in one transaction, and resolve the future of each caller.
+
+    If one operation of the batch raises, the batch transaction rolls back
+    and each operation runs again with its own transaction, so only the
+    failed operation raises its error to its caller.
+
+    :param manager: A database session manager that the writer use.
+    :param batch_size: A maximum number of operations in one transaction.
+    :param maxsize: A maximum number of operations that wait on the queue. The
+        caller will wait for the free space when it is full.
+    """
+
+    def __init__(
+        self,
+        manager: DBSessionManager = sessionmanager,
+        batch_size: int = 100,
+        maxsize: int = 10_000,
+    ) -> None:
+        self.manager: DBSessionManager = manager
+        self.batch_size: int = batch_size
+        self.maxsize: int = maxsize
+        self._queue: Optional[asyncio.Queue[WriteItem]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.peak_queued: int = 0
+        self.batches: int = 0
+        self.writes: int = 0
+        self.failed: int = 0
+        self.retried_batches: int = 0
+        self.batch_sizes: Histogram = Histogram(
+            buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+        )
+        self.wait: Histogram = Histogram()
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        if self.is_running():
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        """Wait for the queued operations to finish and stop the writer task."""
+        if not self.is_running():
+            return
+        await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def submit(self, op: WriteOp[T]) -> T:
+        """Put a write operation to the queue and wait for its result."""
+        if not self.is_running():
+            raise RuntimeError("The write queue does not start yet.")
+
+        item = WriteItem(
+            op=op,
+            future=asyncio.get_running_loop().create_future(),
+            queries=request_queries.get(),
+        )
+        await self._queue.put(item)
+        self.peak_queued = max(self.peak_queued, self._queue.qsize())
+        return await item.future
+
+    async def run_forever(self) -> None:
+        while True:
+            batch: list[WriteItem] = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self.write(batch)
+            except Exception as err:
+                logger.exception(f"Write queue was failed: {err}")
+                for item in batch:
+                    self.resolve(item, error=err)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def write(self, batch: list[WriteItem]) -> None:
+        """Run the operations of a batch in one transaction, and run each
+        operation with its own transaction again if any operation fails.
+        """
+        self.batches += 1
+        self.batch_sizes.observe(len(batch))
+        try:
+            async with self.manager.session() as session:
+                results: list[Any] = [await item.run(session) for item in batch]
+                await session.commit()
+        except Exception as err:
+            if len(batch) == 1:
+                self.resolve(batch[0], error=err)
+                return
+        else:
+            for item, result in zip(batch, results):
+                self.resolve(item, result=result)
+            return
+
+        self.retried_batches += 1
+        for item in batch:
+            try:
+                async with self.manager.session() as session:
+                    result: Any = await item.run(session)
+                    await session.commit()
+            except Exception as err:
+                self.resolve(item, error=err)
+            else:
+                self.resolve(item, result=result)
+
+    def resolve(
+        self,
+        item: WriteItem,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.wait.observe(time.perf_counter() - item.queued_at)
+        if error is not None:
+            self.failed += 1
+        else:
+            self.writes += 1
+
+        # NOTE: The caller can cancel its future while its operation waits
+        #   on the queue, like when the client disconnects.
+        if item.future.done():
+            return
+        if error is not None:
+            item.future.set_exception(error)
+        else:
+            item.future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the statistic values of this queue."""
+        return {
+            "running": self.is_running(),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "peak_queued": self.peak_queued,
+            "batches": self.batches,
+            "writes": self.writes,
+            "failed": self.failed,
+            "retried_batches": self.retried_batches,
+            "batch_size": self.batch_sizes.stats(),
+            "wait": self.wait.stats(),
+        }
+
+
+writer = WriteQueue(
+    batch_size=config.DB_WRITE_QUEUE_BATCH_SIZE,
+    maxsize=config.DB_WRITE_QUEUE_MAXSIZE,
+)
+
+
+async def write(session: AsyncSession, op: WriteOp[T]) -> T:
+    """Run a write operation on the writer queue if it is running, or run it
+    on the current session and commit that session.
+    """
+    if writer.is_running():
+        return await writer.submit(op)
+    result: T = await op(session)
+    await session.commit()
+    return result
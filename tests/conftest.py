@@ -5,6 +5,7 @@ from pathlib import Path
 
 import pytest
 from ddeutil.observe.app import app as server
+from ddeutil.observe.conf import config
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
@@ -57,3 +58,43 @@ def test_create_user(client):
     response = client.get("/home/")
     assert response.status_code == 200
     assert response.json() == []
+
+
+@pytest.fixture
+def refresh_token(client) -> str:
+    """Login with the admin user and return its refresh token that already set
+    to the test client cookies.
+    """
+    response = client.post(
+        "/auth/login",
+        data={
+            "username": config.WEB_ADMIN_USER,
+            "password": config.WEB_ADMIN_PASS,
+            "grant_type": "password",
+        },
+        follow_redirects=False,
+    )
+    assert response.status_code == 302
+    token: str = response.cookies["refresh_token"].strip('"').split()[-1]
+
+    # NOTE: The refresh token cookie was set with secure flag, so it will not
+    #   send back to the http test server.
+    client.cookies.clear()
+    client.cookies.set("refresh_token", f"Bearer {token}")
+    return token
+
+
+@pytest.fixture
+def access_token(client) -> str:
+    """Return the access token of the admin user that is a super user."""
+    response = client.post(
+        "/api/v1/auth/token",
+        data={
+            "username": config.WEB_ADMIN_USER,
+            "password": config.WEB_ADMIN_PASS,
+            "grant_type": "password",
+            "scope": "me",
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["access_token"]
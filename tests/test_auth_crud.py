@@ -0,0 +1,219 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ddeutil.observe.auth import sweeper
+from ddeutil.observe.auth.cache import user_cache
+from ddeutil.observe.auth.context import AuthContext
+from ddeutil.observe.auth.crud import TokenCRUD, UserCRUD
+from ddeutil.observe.auth.models import Token, User
+from ddeutil.observe.db import Base, DBSessionManager
+from sqlalchemy import event, func, inspect, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+@asynccontextmanager
+async def make_sessionmaker(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine, async_sessionmaker(bind=engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def test_user_cache(tmp_path: Path):
+    statements: list[str] = []
+
+    def counter(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async def scenario():
+        async with make_sessionmaker(tmp_path / "t.db") as (engine, maker):
+            async with maker() as session:
+                session.add(
+                    User(
+                        username="cache-user",
+                        email="cache@mail.com",
+                        hashed_password="hashed",
+                    )
+                )
+                await session.commit()
+
+            event.listen(engine.sync_engine, "before_cursor_execute", counter)
+            async with maker() as session:
+                first = await AuthContext().get_user("cache-user", session)
+            async with maker() as session:
+                second = await AuthContext().get_user("cache-user", session)
+                assert second in session
+            event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+            async with maker() as session:
+                await UserCRUD(session).deactivate("cache-user")
+            cached: bool = "cache-user" in user_cache
+
+            async with maker() as session:
+                third = await AuthContext().get_user("cache-user", session)
+            return first, second, third, cached
+
+    user_cache.pop("cache-user")
+    first, second, third, cached = asyncio.run(scenario())
+    assert len(statements) == 1
+    assert first is not second
+    assert first.id == second.id
+    assert not cached
+    assert third.is_active is False
+
+
+def test_token_retention_by_user(tmp_path: Path):
+    now = datetime.now()
+
+    async def scenario():
+        async with make_sessionmaker(tmp_path / "t.db") as (_, maker):
+            async with maker() as session:
+                user = User(
+                    username="retention-user",
+                    email="retention@mail.com",
+                    hashed_password="hashed",
+                )
+                session.add(user)
+                await session.flush()
+
+                # NOTE: The tokens that were created two days ago or more
+                #   will delete.
+                session.add_all(
+                    Token(
+                        user_id=user.id,
+                        digest=f"token-{i}".encode(),
+                        is_active=True,
+                        created_at=now - age,
+                    )
+                    for i, age in enumerate(
+                        (
+                            timedelta(days=1),
+                            timedelta(days=2) - timedelta(minutes=1),
+                            timedelta(days=2, minutes=1),
+                            timedelta(days=3),
+                        )
+                    )
+                )
+                await session.commit()
+                await TokenCRUD(session).retention_by_user(user.id)
+                return (
+                    await session.scalars(
+                        select(Token.digest).order_by(Token.digest)
+                    )
+                ).all()
+
+    assert asyncio.run(scenario()) == [b"token-0", b"token-1"]
+
+
+def test_sweep_expired_tokens(tmp_path: Path, monkeypatch):
+    manager = DBSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path / 't.db'}")
+    monkeypatch.setattr(sweeper, "sessionmanager", manager)
+    now = datetime.now()
+
+    async def scenario():
+        async with manager.connect() as conn:
+            await manager.create_all(conn)
+            stmt = sweeper.expired_tokens(now).compile(
+                dialect=conn.dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+            plan = (
+                await conn.execute(text(f"EXPLAIN QUERY PLAN {stmt}"))
+            ).all()
+
+        async with manager.session() as session:
+            user = User(
+                username="sweep-user",
+                email="sweep@mail.com",
+                hashed_password="hashed",
+            )
+            session.add(user)
+            await session.flush()
+            session.add_all(
+                Token(
+                    user_id=user.id,
+                    digest=f"token-{i}".encode(),
+                    is_active=bool(i % 2),
+                    expires_at=now + timedelta(minutes=i - 7),
+                )
+                for i in range(10)
+            )
+            await session.commit()
+
+        result = await sweeper.sweep_expired_tokens(batch_size=2, now=now)
+        async with manager.session() as session:
+            remain = await session.scalar(
+                select(func.count()).select_from(Token)
+            )
+        await manager.close()
+        return plan, result, remain
+
+    plan, result, remain = asyncio.run(scenario())
+    assert "tokens_expires_at_idx" in str(plan)
+    assert result.deleted == 7
+    assert result.batches == 4
+    assert remain == 3
+    assert sweeper.metrics.last == result
+
+
+def test_migrate_legacy_tokens(tmp_path: Path):
+    async def scenario():
+        async with make_sessionmaker(tmp_path / "t.db") as (engine, maker):
+            async with maker() as session:
+                user = User(
+                    username="legacy-user",
+                    email="legacy@mail.com",
+                    hashed_password="hashed",
+                )
+                session.add(user)
+                await session.commit()
+
+            async with engine.begin() as conn:
+                await conn.exec_driver_sql("DROP TABLE main.tokens")
+                await conn.exec_driver_sql(
+                    "CREATE TABLE main.tokens ("
+                    "id INTEGER PRIMARY KEY, token VARCHAR(450) NOT NULL, "
+                    "is_active BOOLEAN, user_id CHAR(32) NOT NULL, "
+                    "expires_at DATETIME, created_at DATETIME NOT NULL, "
+                    "updated_at DATETIME)"
+                )
+                await conn.exec_driver_sql(
+                    "CREATE UNIQUE INDEX main.tokens_token_idx "
+                    "ON tokens (token)"
+                )
+                await conn.execute(
+                    text(
+                        "INSERT INTO main.tokens (id, token, is_active, "
+                        "user_id, created_at) VALUES (:id, :token, :active, "
+                        ":user_id, '2024-09-02 09:36:00')"
+                    ),
+                    [
+                        {
+                            "id": i,
+                            "token": f"legacy-{i}",
+                            "active": i != 2,
+                            "user_id": user.id.hex,
+                        }
+                        for i in range(1, 4)
+                    ],
+                )
+
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                tables = await conn.run_sync(
+                    lambda c: inspect(c).get_table_names(schema="main")
+                )
+
+            async with maker() as session:
+                disable = await Token.get_disable(session, token="legacy-2")
+                active = await Token.get(session, token="legacy-3")
+            return tables, disable, active
+
+    tables, disable, active = asyncio.run(scenario())
+    assert "tokens_legacy" not in tables
+    assert disable.id == 2
+    assert active.is_active
@@ -0,0 +1,56 @@
+from ddeutil.observe.conf import config
+
+
+def test_read_stats(client):
+    response = client.post(
+        "/api/v1/auth/token",
+        data={
+            "username": config.WEB_ADMIN_USER,
+            "password": config.WEB_ADMIN_PASS,
+            "grant_type": "password",
+            "scope": "me",
+        },
+    )
+    assert response.status_code == 200
+    access_token: str = response.json()["access_token"]
+
+    response = client.get(
+        "/api/v1/auth/stats",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["password_hash"]["completed"] >= 1
+    assert stats["password_hash"]["queued"] == 0
+    assert "hit_ratio" in stats["revoked_tokens"]
+    assert "hit_ratio" in stats["users"]
+    assert "db_pool" not in stats
+
+
+def test_deactivate_and_delete_user(client, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = client.post(
+        "/auth/register",
+        data={
+            "username": "admin-target",
+            "email": "admin-target@mail.com",
+            "password": "P@ssw0rd",
+        },
+        follow_redirects=False,
+    )
+    assert response.status_code == 307
+    assert (
+        client.post("/api/v1/auth/user/admin-target/deactivate").status_code
+        == 401
+    )
+
+    response = client.post(
+        "/api/v1/auth/user/admin-target/deactivate", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+
+    response = client.delete("/api/v1/auth/user/admin-target", headers=headers)
+    assert response.status_code == 204
+    response = client.delete("/api/v1/auth/user/admin-target", headers=headers)
+    assert response.status_code == 404
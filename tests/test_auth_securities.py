@@ -1,12 +1,16 @@
+import asyncio
 import time
 from datetime import timedelta
 
 import pytest
 from ddeutil.observe.auth.securities import (
+    PasswordHashPool,
     create_access_token,
     create_refresh_token,
     decode_access_token,
     decode_refresh_token,
+    get_password_hash,
+    verify_password,
 )
 from jwt.exceptions import ExpiredSignatureError, InvalidSignatureError
 
@@ -49,3 +53,27 @@ def test_refresh_token_raise():
 
     with pytest.raises(InvalidSignatureError):
         decode_access_token(token[:-6] + "extend")
+
+
+def test_password_hash_pool():
+    pool = PasswordHashPool(max_workers=2)
+
+    async def scenario():
+        hashed = await pool.run(get_password_hash, "P@ssW0rd")
+        return await asyncio.gather(
+            *(
+                pool.run(verify_password, password, hashed)
+                for password in ("P@ssW0rd", "wrong", "P@ssW0rd", "other")
+            )
+        )
+
+    try:
+        assert asyncio.run(scenario()) == [True, False, True, False]
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert stats["completed"] == 5
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["peak_queued"] >= 2
@@ -0,0 +1,126 @@
+import asyncio
+
+from ddeutil.observe.auth.cache import revoked_tokens, token_claims
+from ddeutil.observe.auth.crud import (
+    revoke_token_cache,
+    verify_access_token,
+    verify_refresh_token,
+)
+from ddeutil.observe.auth.securities import create_refresh_token, token_digest
+from ddeutil.observe.backend import OAuth2Backend, OAuth2Middleware
+from ddeutil.observe.db import sessionmanager
+from sqlalchemy import event
+
+from .utils import assert_max_queries
+
+
+def test_oauth2_middleware_skip():
+    middleware = OAuth2Middleware(
+        app=None,
+        backend=OAuth2Backend(),
+        skip_paths=["/static/*", "/api/v1/"],
+    )
+    assert middleware.is_skip("/static/css/base.css")
+    assert middleware.is_skip("/api/v1/")
+    assert not middleware.is_skip("/api/v1/workflow/")
+    assert not middleware.is_skip("/workflow")
+
+
+def test_oauth2_middleware_no_query(client, refresh_token):
+    statements: list[str] = []
+
+    def counter(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = sessionmanager._engine.sync_engine
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        # NOTE: The first request will cache the token state.
+        assert client.get("/not-found").status_code == 404
+        assert len(statements) == 1
+        statements.clear()
+
+        assert client.get("/not-found").status_code == 404
+        assert client.get("/static/css/base.css").status_code == 200
+        assert client.get("/api/v1/").status_code == 200
+        assert statements == []
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+def test_logout_revoke_cache(client, refresh_token):
+    response = client.post("/auth/logout", follow_redirects=False)
+    assert response.status_code == 302
+    assert revoked_tokens.get(token_digest(refresh_token)) is True
+
+
+def test_verify_token_claims_cache():
+    token: str = create_refresh_token({"sub": "demo", "scopes": ["me"]})
+    key: bytes = token_digest(token)
+    revoked_tokens.set(key, False)
+    hits: int = token_claims.hits
+
+    async def scenario():
+        first = await verify_refresh_token(token, session=None)
+        second = await verify_refresh_token(token, session=None)
+
+        # NOTE: The refresh token does not valid for the access token even if
+        #   its claims was cached.
+        access = await verify_access_token(token, session=None)
+        return first, second, access
+
+    first, second, access = asyncio.run(scenario())
+    assert first.username == "demo"
+    assert second is first
+    assert access is None
+    assert token_claims.hits == hits + 1
+
+    revoke_token_cache(token)
+    assert ("refresh", key) not in token_claims
+    assert asyncio.run(verify_refresh_token(token, session=None)) is None
+
+
+def test_auth_context_query_once(client, refresh_token):
+    statements: list[str] = []
+
+    def counter(conn, cursor, statement, *args):
+        if "FROM main.tokens" in statement or "FROM main.users" in statement:
+            statements.append(statement)
+
+    engine = sessionmanager._engine.sync_engine
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        # NOTE: The token state and its owner load together in one query.
+        revoked_tokens.pop(token_digest(refresh_token))
+        assert client.get("/workflow/").status_code == 200
+        assert len(statements) == 1
+        statements.clear()
+
+        # NOTE: The cached token state and user do not query again.
+        assert client.get("/workflow/").status_code == 200
+        assert statements == []
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+def test_query_budget(client, refresh_token):
+    response = client.get("/workflow/")
+    assert response.status_code == 200
+    assert_max_queries(response, 2)
+    assert float(response.headers["X-DB-Time"]) >= 0
+
+    response = client.get("/workflow/search", params={"search_text": "wf"})
+    assert response.status_code == 200
+    assert_max_queries(response, 2)
+
+    response = client.post("/auth/logout", follow_redirects=False)
+    assert response.status_code == 302
+    assert_max_queries(response, 2)
+
+
+def test_search_workflows_bounds(client, refresh_token):
+    for params in ({"skip": -1}, {"limit": 0}, {"limit": 1001}):
+        response = client.get(
+            "/workflow/search", params={"search_text": "wf", **params}
+        )
+        assert response.status_code == 422
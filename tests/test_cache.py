@@ -0,0 +1,41 @@
+from ddeutil.observe.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache():
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    assert "b" in cache
+
+    # NOTE: The `b` key is the least recently used key.
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert len(cache) == 2
+
+    timer.now = 11
+    assert cache.get("a") is None
+    assert cache.get("c", 0) == 0
+    assert len(cache) == 0
+
+    cache.set("d", 4, ttl=100)
+    assert cache.pop("d") == 4
+    assert cache.pop("d") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_ttl_cache_disable():
+    cache: TTLCache[str, int] = TTLCache(maxsize=0, ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.hit_ratio == 0.0
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import zlib
+from pathlib import Path
+
+import pytest
+from ddeutil.observe.db import (
+    CompressedJSON,
+    DBSessionManager,
+    engine_options,
+    train_zdict,
+)
+from ddeutil.observe.metrics import Histogram
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+CONTEXT = {
+    "name": "wf-scheduling",
+    "on": "*/3 * * * *",
+    "context": {
+        "params": {"asat-dt": "2024-09-02 09:36:00+07:00"},
+        "jobs": {"some-job": {"matrix": {}, "stages": {}}},
+    },
+}
+
+
+def test_compressed_json():
+    zdict: bytes = train_zdict([CONTEXT] * 10)
+    column = CompressedJSON(zdict=zdict)
+    value = column.process_bind_param(CONTEXT, None)
+    assert value[:1] == b"\x78"
+    assert len(value) < len(json.dumps(CONTEXT))
+    assert column.process_result_value(value, None) == CONTEXT
+
+    # NOTE: Read the value that compressed with the old dictionary.
+    column_new = CompressedJSON(zdict=b'"new":', old_zdicts=[zdict])
+    assert column_new.process_result_value(value, None) == CONTEXT
+
+    with pytest.raises(ValueError):
+        CompressedJSON(zdict=b'"new":').process_result_value(value, None)
+
+    # NOTE: Read the plain and legacy JSON values.
+    assert column.process_bind_param({"a": 1}, None) == b'{"a":1}'
+    assert column.process_result_value(b'{"a":1}', None) == {"a": 1}
+    assert column.process_result_value('{"a": 1}', None) == {"a": 1}
+    assert (
+        column.process_result_value(
+            zlib.compress(json.dumps(CONTEXT).encode()), None
+        )
+        == CONTEXT
+    )
+
+
+def test_compressed_json_column(tmp_path: Path):
+    metadata = MetaData()
+    table = Table(
+        "logs",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("context", CompressedJSON(zdict=train_zdict([CONTEXT]))),
+    )
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 't.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(
+                text("INSERT INTO logs (id, context) VALUES (1, :v)"),
+                {"v": json.dumps(CONTEXT)},
+            )
+            await conn.execute(insert(table), [{"id": 2, "context": CONTEXT}])
+            rs = (await conn.execute(select(table.c.context))).scalars().all()
+        await engine.dispose()
+        return rs
+
+    assert asyncio.run(scenario()) == [CONTEXT, CONTEXT]
+
+
+def test_engine_options():
+    options = engine_options("sqlite+aiosqlite:///./observe.db")
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"] == {"check_same_thread": False}
+    assert "pool_size" not in options
+
+    options = engine_options("postgresql+asyncpg://observe@localhost/observe")
+    assert issubclass(options["poolclass"], QueuePool)
+    assert "connect_args" not in options
+    assert options["pool_size"] == 5
+    assert options["max_overflow"] == 10
+
+
+def test_pool_metrics(tmp_path: Path):
+    manager = DBSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+
+    async def scenario():
+        async with manager.session() as s1, manager.session() as s2:
+            await s1.execute(text("SELECT 1"))
+            await s2.execute(text("SELECT 1"))
+            during = manager.pool_stats()
+        after = manager.pool_stats()
+        await manager.close()
+        return during, after
+
+    during, after = asyncio.run(scenario())
+    assert during["pool"] == "InstrumentedNullPool"
+    assert during["checked_out"] == 2
+    assert after["checked_out"] == 0
+    assert after["peak_checked_out"] == 2
+    assert after["checkouts"] == 2
+    assert after["wait"]["count"] == 2
+
+
+def test_histogram():
+    histogram = Histogram(buckets=[0.1, 1.0])
+    for value in (0.05, 0.05, 0.5, 3.0):
+        histogram.observe(value)
+    stats = histogram.stats()
+    assert stats["buckets"] == {"0.1": 2, "1": 3, "+Inf": 4}
+    assert stats["p50"] == 0.1
+    assert stats["p99"] == 3.0
+
+
+def test_read_only_session(tmp_path: Path):
+    url: str = f"sqlite+aiosqlite:///{tmp_path / 'rw.db'}"
+    manager = DBSessionManager()
+    manager.init(url, read_host=url)
+
+    async def scenario():
+        async with manager.session() as session:
+            await session.execute(text("CREATE TABLE t (id INTEGER)"))
+            await session.execute(text("INSERT INTO t VALUES (1)"))
+            await session.commit()
+
+        async with manager.session(read_only=True) as session:
+            rows = (await session.execute(text("SELECT id FROM t"))).all()
+            with pytest.raises(OperationalError):
+                await session.execute(text("INSERT INTO t VALUES (2)"))
+
+        read_stats = manager.pool_stats(read_only=True)
+        await manager.close()
+        return rows, read_stats
+
+    rows, read_stats = asyncio.run(scenario())
+    assert rows == [(1,)]
+    assert read_stats["checkouts"] == 1
+    assert not manager.has_read_engine()
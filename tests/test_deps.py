@@ -0,0 +1,22 @@
+from ddeutil.observe.deps import TEMPLATES, get_templates, init_templates
+from starlette.requests import Request
+
+
+def make_request(path: str) -> Request:
+    return Request(
+        {"type": "http", "path": path, "headers": [], "query_string": b""}
+    )
+
+
+def test_get_templates():
+    init_templates()
+    assert {"", "auth", "workflow"} <= set(TEMPLATES)
+
+    workflow = get_templates(make_request("/workflow/search"))
+    assert workflow is TEMPLATES["workflow"]
+    assert workflow is get_templates(make_request("/workflow"))
+    assert get_templates(make_request("/auth/login")) is TEMPLATES["auth"]
+    assert get_templates(make_request("/index")) is TEMPLATES["auth"]
+    assert get_templates(make_request("/")) is TEMPLATES[""]
+    assert workflow.get_template("workflow/workflow.html") is not None
+    assert workflow.get_template("index.html") is not None
@@ -0,0 +1,99 @@
+import asyncio
+
+from ddeutil.observe.conf import config
+from ddeutil.observe.metrics import RouteMetrics
+from ddeutil.observe.middleware import ProcessTimeMiddleware
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+
+def test_route_metrics():
+    metrics = RouteMetrics(buckets=[0.1, 1.0])
+    metrics.observe("GET", "/workflow/", 200, 0.05)
+    metrics.observe("GET", "/workflow/", 200, 0.5)
+    metrics.observe("GET", "/workflow/search", 200, 2.0)
+
+    stats = metrics.stats()
+    assert [s["route"] for s in stats] == ["/workflow/search", "/workflow/"]
+    assert stats[1]["count"] == 2
+    assert stats[1]["p50"] == 0.1
+
+    text: str = metrics.render()
+    assert "observe_http_requests_in_flight 0" in text
+    assert (
+        'observe_http_request_duration_seconds_bucket{method="GET",'
+        'route="/workflow/",status="200",le="0.1"} 1'
+    ) in text
+    assert (
+        'observe_http_request_duration_seconds_count{method="GET",'
+        'route="/workflow/search",status="200"} 1'
+    ) in text
+    assert "quantile" not in text
+
+
+def test_read_metrics(client):
+    response = client.post(
+        "/api/v1/auth/token",
+        data={
+            "username": config.WEB_ADMIN_USER,
+            "password": config.WEB_ADMIN_PASS,
+            "grant_type": "password",
+            "scope": "me",
+        },
+    )
+    access_token: str = response.json()["access_token"]
+    assert client.get("/api/v1/").status_code == 200
+    assert client.get("/not-found").status_code == 404
+
+    response = client.get(
+        "/api/v1/metrics",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/v1/",status="200"' in response.text
+    assert 'route="/api/v1/auth/token",status="200"' in response.text
+    assert 'route="unmatched",status="404"' in response.text
+
+
+def test_read_db_and_route_metrics(client, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/api/v1/metrics/db").status_code == 401
+
+    response = client.get("/api/v1/metrics/db", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["pool"]["checkouts"] >= 1
+    assert stats["read_pool"] is None
+    assert stats["writer"]["running"] is False
+
+    response = client.get("/api/v1/metrics/routes", headers=headers)
+    assert response.status_code == 200
+    assert "/api/v1/metrics/db" in {r["route"] for r in response.json()}
+
+
+def test_process_time_middleware():
+    async def stream(_):
+        async def body():
+            yield b"a"
+            await asyncio.sleep(0.05)
+            yield b"b"
+
+        return StreamingResponse(body())
+
+    metrics = RouteMetrics()
+    app = Starlette(routes=[Route("/items/{name}", stream)])
+    app.add_middleware(ProcessTimeMiddleware, metrics=metrics)
+
+    response = TestClient(app).get("/items/foo")
+    assert response.text == "ab"
+    assert response.headers["X-DB-Queries"] == "0"
+    assert float(response.headers["X-Process-Time"]) < 0.05
+
+    # NOTE: The histogram has the time until the response body was sent.
+    (stats,) = metrics.stats()
+    assert stats["status"] == 200
+    assert stats["sum"] >= 0.05
+    assert metrics.in_flight == 0
@@ -0,0 +1,87 @@
+import asyncio
+
+from ddeutil.observe.conf import config
+from ddeutil.observe.profiler import (
+    OTHER,
+    StatementProfiler,
+    normalize,
+    request_scope,
+)
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+def test_normalize():
+    assert normalize("SELECT *\n  FROM t WHERE id = 1 AND name = 'a''b'") == (
+        "SELECT * FROM t WHERE id = ? AND name = ?"
+    )
+    assert normalize("SELECT * FROM t WHERE id IN (?, ?, ?)") == (
+        "SELECT * FROM t WHERE id IN (?...)"
+    )
+    assert normalize("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == (
+        "INSERT INTO t (a, b) VALUES (?...)"
+    )
+    assert normalize("SELECT t1.col2 FROM t1 LIMIT 10") == (
+        "SELECT t1.col2 FROM t1 LIMIT ?"
+    )
+
+
+def test_statement_profiler():
+    profiler = StatementProfiler(slow_threshold=0.5, maxsize=2)
+    profiler.observe("SELECT * FROM t WHERE id = 1", 0.1)
+    profiler.observe("SELECT * FROM t WHERE id = 2", 0.2)
+    profiler.observe("SELECT * FROM u", 1.0)
+    profiler.observe("SELECT * FROM v", 0.1)
+
+    top = profiler.top(order="count")
+    assert top[0]["statement"] == "SELECT * FROM t WHERE id = ?"
+    assert top[0]["count"] == 2
+    assert top[0]["max"] == 0.2
+    assert {row["statement"] for row in top} == {
+        "SELECT * FROM t WHERE id = ?",
+        "SELECT * FROM u",
+        OTHER,
+    }
+    assert profiler.top(limit=1)[0]["slow"] == 1
+    assert profiler.slow_queries[0].statement == "SELECT * FROM u"
+    assert profiler.slow_queries[0].route is None
+
+
+def test_statement_profiler_listen():
+    profiler = StatementProfiler(slow_threshold=0)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    profiler.listen(engine.sync_engine)
+
+    async def scenario():
+        request_scope.set({"endpoint": object(), "root_path": "/static"})
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        await engine.dispose()
+
+    asyncio.run(scenario())
+    rows = {row["statement"]: row for row in profiler.top()}
+    assert rows["SELECT ?"]["count"] == 2
+    assert profiler.slow_queries[-1].route == "/static/*"
+
+
+def test_read_sql_metrics(client):
+    response = client.post(
+        "/api/v1/auth/token",
+        data={
+            "username": config.WEB_ADMIN_USER,
+            "password": config.WEB_ADMIN_PASS,
+            "grant_type": "password",
+            "scope": "me",
+        },
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = client.get("/api/v1/metrics/sql?order=count", headers=headers)
+    assert response.status_code == 200
+    statements = response.json()["statements"]
+    assert statements
+    assert all(s["count"] >= 1 for s in statements)
+
+    response = client.delete("/api/v1/metrics/sql", headers=headers)
+    assert response.status_code == 204
@@ -0,0 +1,122 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from ddeutil.observe.auth.models import RateLimit, Tier
+from ddeutil.observe.db import Base
+from ddeutil.observe.ratelimit import (
+    MemoryBackend,
+    PathMatcher,
+    RateLimitBackend,
+    RateLimiter,
+    RateLimitMiddleware,
+    Rule,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+
+def test_path_matcher():
+    matcher = PathMatcher(
+        [
+            Rule("api", "/api/*", 10, 60),
+            Rule("workflow", "/api/v1/workflow/*", 5, 60),
+            Rule("token", "/api/v1/auth/token", 1, 60),
+        ]
+    )
+    assert matcher.match("/api/v1/auth/token").name == "token"
+    assert matcher.match("/api/v1/auth/token/me/").name == "api"
+    assert matcher.match("/api/v1/workflow/").name == "workflow"
+    assert matcher.match("/workflow/") is None
+    assert PathMatcher([]).match("/api/") is None
+
+
+def test_memory_backend_sliding_window():
+    now: list[float] = [120.0]
+    backend = MemoryBackend(timer=lambda: now[0])
+
+    def hit():
+        return asyncio.run(backend.hit("key", limit=4, period=60))
+
+    assert [hit().allowed for _ in range(5)] == [True] * 4 + [False]
+    assert hit().retry_after == 60
+
+    # NOTE: A half of the previous window still counts on the next window.
+    now[0] = 210.0
+    assert [hit().allowed for _ in range(3)] == [True, True, False]
+
+    now[0] = 400.0
+    assert hit().remaining == 3
+
+
+def test_rate_limit_backend_abstract():
+
+    class Backend(RateLimitBackend): ...
+
+    with pytest.raises(TypeError):
+        Backend()
+
+
+def test_rate_limit_middleware():
+    limiter = RateLimiter(MemoryBackend(timer=lambda: 120.0))
+    limiter.set_rules([Rule("home", "/limited", 2, 60)])
+    app = Starlette(
+        routes=[
+            Route("/limited", lambda _: PlainTextResponse("ok")),
+            Route("/free", lambda _: PlainTextResponse("ok")),
+        ]
+    )
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    client = TestClient(app)
+
+    response = client.get("/limited")
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "1"
+    assert client.get("/limited").status_code == 200
+
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+    assert "X-RateLimit-Limit" not in client.get("/free").headers
+
+
+def test_rate_limiter_load(tmp_path: Path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 't.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+        async with maker() as session:
+            session.add_all(
+                [Tier(id=1, name="default"), Tier(id=2, name="pro")]
+            )
+            await session.flush()
+            session.add_all(
+                [
+                    RateLimit(
+                        tier_id=1, name="d", path="/api/*", limit=1, period=60
+                    ),
+                    RateLimit(
+                        tier_id=2, name="p", path="/api/*", limit=9, period=60
+                    ),
+                ]
+            )
+            await session.commit()
+
+            limiter = RateLimiter(MemoryBackend())
+            rules = await limiter.load(session, tier="default")
+        await engine.dispose()
+        first = await limiter.hit("/api/v1/", "host:a")
+        second = await limiter.hit("/api/v1/", "host:a")
+        other = await limiter.hit("/api/v1/", "host:b")
+        return rules, first, second, other
+
+    rules, first, second, other = asyncio.run(scenario())
+    assert [r.name for r in rules] == ["d"]
+    assert first.allowed
+    assert not second.allowed
+    assert other.allowed
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from ddeutil.observe.utils import decode_cursor, encode_cursor, iter_lines
+
+
+def test_cursor():
+    assert decode_cursor(encode_cursor(5000)) == 5000
+
+    for cursor in ("not-valid", encode_cursor(1)[:-2], "e30"):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+def test_iter_lines():
+
+    async def stream():
+        for chunk in (b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}'):
+            yield chunk
+
+    async def collect():
+        return [line async for line in iter_lines(stream())]
+
+    assert asyncio.run(collect()) == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+def test_iter_lines_max_line():
+
+    async def stream():
+        yield b'{"a": 1}\n'
+        for _ in range(10):
+            yield b"x" * 10
+
+    async def collect(max_line: int):
+        return [line async for line in iter_lines(stream(), max_line=max_line)]
+
+    assert asyncio.run(collect(100)) == [b'{"a": 1}', b"x" * 100]
+    with pytest.raises(ValueError):
+        asyncio.run(collect(99))
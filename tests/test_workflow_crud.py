@@ -0,0 +1,202 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from ddeutil.observe.routes.workflow import models as md
+from ddeutil.observe.routes.workflow.crud import (
+    create_release_log,
+    create_release_log_stream,
+    list_workflows,
+    search_workflow,
+)
+from ddeutil.observe.routes.workflow.retention import compact
+from ddeutil.observe.routes.workflow.schemas import (
+    LogCreate,
+    ReleaseLog,
+    ReleaseLogCreate,
+    WorkflowViews,
+)
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+@asynccontextmanager
+async def make_session(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(md.Base.metadata.create_all)
+
+    maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with maker() as session:
+        yield session
+    await engine.dispose()
+
+
+def test_create_release_log(tmp_path: Path):
+
+    async def scenario():
+        async with make_session(tmp_path / "t.db") as session:
+            session.add(md.Workflows(name="wf", params={}, on=[], jobs={}))
+            await session.commit()
+
+            rs = await create_release_log(
+                session,
+                1,
+                ReleaseLogCreate(
+                    release=20240902093600,
+                    logs=[
+                        {"run_id": f"run-{i}", "context": {"i": i}}
+                        for i in range(50)
+                    ],
+                ),
+            )
+            release = ReleaseLog.model_validate(rs)
+            count = await session.scalar(
+                select(func.count()).select_from(md.WorkflowLogs)
+            )
+        return release, count
+
+    release, count = asyncio.run(scenario())
+    assert count == 50
+    assert len(release.logs) == 50
+    assert release.logs[0].release_id == 1
+    assert release.logs[49].context == {"i": 49}
+
+
+def test_search_workflow(tmp_path: Path):
+
+    async def scenario():
+        async with make_session(tmp_path / "t.db") as session:
+            session.add_all(
+                [
+                    md.Workflows(
+                        name=name, desc=desc, params={}, on=[], jobs={}
+                    )
+                    for name, desc in [
+                        ("wf-scheduling", None),
+                        ("wf-trigger", "Trigger the scheduling workflow"),
+                        ("wf_batch_job", "Batch 100% of data"),
+                    ]
+                ]
+            )
+            await session.commit()
+
+            rs = {}
+            for text in ("SCHED", "wf", "%", "_b", "not-found"):
+                rs[text] = [
+                    wf.name for wf in await search_workflow(session, text)
+                ]
+
+            # NOTE: The index should sync with the updated name.
+            await session.execute(
+                update(md.Workflows)
+                .where(md.Workflows.id == 1)
+                .values(name="wf-renamed")
+            )
+            await session.commit()
+            rs["renamed"] = [
+                wf.name for wf in await search_workflow(session, "renamed")
+            ]
+            rs["paging"] = [
+                wf.name
+                for wf in await search_workflow(session, "wf-", skip=1, limit=1)
+            ]
+        return rs
+
+    rs = asyncio.run(scenario())
+    assert set(rs["SCHED"]) == {"wf-scheduling", "wf-trigger"}
+    assert len(rs["wf"]) == 3
+    assert rs["%"] == ["wf_batch_job"]
+    assert rs["_b"] == ["wf_batch_job"]
+    assert rs["not-found"] == []
+    assert rs["renamed"] == ["wf-renamed"]
+    assert len(rs["paging"]) == 1
+
+
+def test_release_summary(tmp_path: Path):
+
+    async def scenario():
+        async with make_session(tmp_path / "t.db") as session:
+            session.add(
+                md.Workflows(
+                    name="wf",
+                    params={},
+                    on=[],
+                    jobs={},
+                    valid_start=datetime.now(),
+                    valid_end=datetime(2999, 12, 31),
+                )
+            )
+            await session.commit()
+
+            for release, run_id in (
+                (20240902093600, "r1"),
+                (20240901000000, "r2"),
+            ):
+                await create_release_log(
+                    session,
+                    1,
+                    ReleaseLogCreate(
+                        release=release,
+                        logs=[
+                            {"run_id": run_id, "context": {"status": "success"}}
+                        ],
+                    ),
+                )
+            await create_release_log_stream(
+                session, 1, release=20240903000000, logs=iter_logs()
+            )
+            session.expunge_all()
+            return WorkflowViews.validate_python(await list_workflows(session))
+
+    async def iter_logs():
+        for i in range(3):
+            yield LogCreate(run_id=f"s{i}")
+
+    workflows = asyncio.run(scenario())
+    summary = workflows[0].summary
+    assert summary.release_count == 3
+    assert summary.latest_release == 20240903000000
+    assert summary.last_run_id == "s2"
+    assert summary.last_run_status is None
+
+
+def test_create_release_log_stream_cancel(tmp_path: Path):
+
+    async def iter_logs():
+        for i in range(3):
+            yield LogCreate(run_id=f"c{i}")
+        raise asyncio.CancelledError()
+
+    async def scenario():
+        async with make_session(tmp_path / "t.db") as session:
+            session.add(md.Workflows(name="wf", params={}, on=[], jobs={}))
+            await session.commit()
+            with pytest.raises(asyncio.CancelledError):
+                await create_release_log_stream(
+                    session,
+                    1,
+                    release=20240903000000,
+                    logs=iter_logs(),
+                    chunk_size=2,
+                )
+            return [
+                await session.scalar(select(func.count()).select_from(model))
+                for model in (md.WorkflowReleases, md.WorkflowLogs)
+            ]
+
+    assert asyncio.run(scenario()) == [0, 0]
+
+
+def test_compact_without_incremental_vacuum(tmp_path: Path):
+
+    async def scenario():
+        async with make_session(tmp_path / "t.db") as session:
+            conn = await session.connection()
+            await conn.exec_driver_sql("PRAGMA auto_vacuum = NONE")
+            await conn.exec_driver_sql("VACUUM")
+            return await compact(session)
+
+    assert asyncio.run(scenario()) is False
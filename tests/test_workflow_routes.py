@@ -0,0 +1,279 @@
+import json
+import sqlite3
+from datetime import datetime
+
+from ddeutil.observe.conf import config
+
+from .conftest import db_path
+from .utils import assert_max_queries
+
+WORKFLOW = {
+    "name": "wf-stream",
+    "params": {"asat-dt": {"type": "datetime"}},
+    "on": [{"cronjob": "*/3 * * * *", "timezone": "Asia/Bangkok"}],
+    "jobs": {"some-job": {"stages": [{"name": "Empty"}]}},
+}
+
+
+def test_create_workflow_release_stream(client):
+    response = client.post("/api/v1/workflow/", json=WORKFLOW)
+    assert response.status_code in (200, 302)
+
+    def body():
+        for i in range(25):
+            yield json.dumps({"run_id": f"stream-{i}", "context": {}}).encode()
+            yield b"\n"
+
+    response = client.post(
+        "/api/v1/workflow/wf-stream/release/stream",
+        params={"release": 20240902093600},
+        headers={"Content-Type": "application/x-ndjson"},
+        content=body(),
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 25
+
+
+def test_create_workflow_release_stream_raise(client):
+    client.post("/api/v1/workflow/", json=WORKFLOW)
+    response = client.post(
+        "/api/v1/workflow/wf-stream/release/stream",
+        params={"release": 20240902093600},
+        content=b"{}",
+    )
+    assert response.status_code == 415
+
+    response = client.post(
+        "/api/v1/workflow/wf-stream/release/stream",
+        params={"release": 20240902093700},
+        headers={"Content-Type": "application/x-ndjson"},
+        content=b'{"run_id": "stream-ok"}\n{"context": {}}\n',
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Line 2")
+
+
+def test_create_workflow_release_stream_duplicate(client, monkeypatch):
+    client.post("/api/v1/workflow/", json=WORKFLOW)
+    monkeypatch.setattr(config, "WORKFLOW_INGEST_CHUNK_SIZE", 2)
+
+    # NOTE: The duplicate run ID is on the second chunk, and on the last
+    #   partial chunk.
+    for release, run_ids, chunk_size in (
+        (20240902094800, ("dup-0", "dup-1", "dup-0", "dup-2"), 2),
+        (20240902094900, ("dup-0", "dup-1", "dup-2", "dup-3", "dup-0"), 3),
+    ):
+        monkeypatch.setattr(config, "WORKFLOW_INGEST_CHUNK_SIZE", chunk_size)
+        response = client.post(
+            "/api/v1/workflow/wf-stream/release/stream",
+            params={"release": release},
+            headers={"Content-Type": "application/x-ndjson"},
+            content=b"".join(
+                json.dumps({"run_id": run_id, "context": {}}).encode() + b"\n"
+                for run_id in run_ids
+            ),
+        )
+        assert response.status_code == 409
+
+        with sqlite3.connect(db_path) as conn:
+            releases = conn.execute(
+                "SELECT COUNT(*) FROM workflow_releases WHERE release = ?",
+                (release,),
+            ).fetchone()[0]
+            logs = conn.execute(
+                "SELECT COUNT(*) FROM workflow_logs WHERE run_id LIKE 'dup-%'"
+            ).fetchone()[0]
+        assert releases == 0
+        assert logs == 0
+
+
+def test_read_all_cursor(client):
+    for i in range(3):
+        client.post("/api/v1/workflow/", json={**WORKFLOW, "name": f"wf-{i}"})
+
+    ids: list[int] = []
+    cursor = None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = client.get("/api/v1/workflow/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        ids.extend(wf["id"] for wf in page["items"])
+        if (cursor := page["next_cursor"]) is None:
+            break
+
+    assert len(ids) >= 3
+    assert ids == sorted(set(ids))
+
+    response = client.get("/api/v1/workflow/", params={"cursor": "not-valid"})
+    assert response.status_code == 400
+
+
+def test_read_all_stream(client):
+    client.post("/api/v1/workflow/", json={**WORKFLOW, "name": "wf-0"})
+
+    response = client.get("/api/v1/workflow/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert "wf-0" in {row["name"] for row in rows}
+
+    response = client.get("/api/v1/workflow/stream", params={"format": "json"})
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()] == [row["id"] for row in rows]
+
+
+def test_create_workflow_release_stream_retry(client, monkeypatch):
+    client.post("/api/v1/workflow/", json=WORKFLOW)
+    monkeypatch.setattr(config, "WORKFLOW_INGEST_CHUNK_SIZE", 2)
+
+    def body(invalid: bool):
+        for i in range(5):
+            yield json.dumps({"run_id": f"retry-{i}", "context": {}}).encode()
+            yield b"\n"
+        if invalid:
+            yield b'{"context": {}}\n'
+
+    # NOTE: The failed stream should not keep the committed chunks, so the
+    #   same release can send again.
+    for invalid, code in ((True, 422), (False, 200)):
+        response = client.post(
+            "/api/v1/workflow/wf-stream/release/stream",
+            params={"release": 20240902094500},
+            headers={"Content-Type": "application/x-ndjson"},
+            content=body(invalid),
+        )
+        assert response.status_code == code
+    assert response.json()["count"] == 5
+
+
+def test_create_workflow_release_stream_max_line(client, monkeypatch):
+    client.post("/api/v1/workflow/", json=WORKFLOW)
+    monkeypatch.setattr(config, "WORKFLOW_INGEST_MAX_LINE", 100)
+
+    def body():
+        yield json.dumps({"run_id": "max-line-0", "context": {}}).encode()
+        yield b"\n"
+        for _ in range(10):
+            yield b"x" * 20
+
+    response = client.post(
+        "/api/v1/workflow/wf-stream/release/stream",
+        params={"release": 20240902094200},
+        headers={"Content-Type": "application/x-ndjson"},
+        content=body(),
+    )
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Line 2:")
+
+
+def test_retention(client, access_token, monkeypatch):
+    client.post("/api/v1/workflow/", json={**WORKFLOW, "name": "wf-retention"})
+    for i in range(3):
+        response = client.post(
+            "/api/v1/workflow/wf-retention/release",
+            json={
+                "release": 20240902093600 + i,
+                "logs": [
+                    {"run_id": f"retention-{i}-{j}", "context": {"j": j}}
+                    for j in range(5)
+                ],
+            },
+        )
+        assert response.status_code == 200
+        assert len(response.json()["logs"]) == 5
+
+    monkeypatch.setattr(config, "WORKFLOW_RETENTION_KEEP_RELEASES", 1)
+    monkeypatch.setattr(config, "WORKFLOW_RETENTION_BATCH_SIZE", 2)
+    assert client.post("/api/v1/workflow/retention").status_code == 401
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = client.post("/api/v1/workflow/retention", headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["releases_deleted"] >= 2
+    assert result["logs_deleted"] >= 10
+    assert result["incremental_vacuum"] is True
+
+    # NOTE: Run again should not delete anything.
+    response = client.post("/api/v1/workflow/retention", headers=headers)
+    assert response.json()["releases_deleted"] == 0
+
+    assert client.get("/api/v1/workflow/retention").status_code == 401
+    metrics = client.get("/api/v1/workflow/retention", headers=headers).json()
+    assert metrics["runs"] >= 2
+    assert metrics["last"]["releases_deleted"] == 0
+
+
+def test_retention_keep_days(client, access_token, monkeypatch):
+    client.post("/api/v1/workflow/", json={**WORKFLOW, "name": "wf-expired"})
+    client.post("/api/v1/workflow/", json={**WORKFLOW, "name": "wf-recent"})
+    recent: int = int(datetime.now().strftime("%Y%m%d%H%M%S"))
+    for name, releases in (
+        ("wf-expired", (20240902093600, 20240902093900)),
+        ("wf-recent", (20240902093600, recent)),
+    ):
+        for release in releases:
+            response = client.post(
+                f"/api/v1/workflow/{name}/release",
+                json={
+                    "release": release,
+                    "logs": [
+                        {
+                            "run_id": f"{name}-{release}",
+                            "context": {"status": "success"},
+                        }
+                    ],
+                },
+            )
+            assert response.status_code == 200
+
+    monkeypatch.setattr(config, "WORKFLOW_RETENTION_KEEP_RELEASES", 0)
+    monkeypatch.setattr(config, "WORKFLOW_RETENTION_KEEP_DAYS", 7)
+    response = client.post(
+        "/api/v1/workflow/retention",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["releases_deleted"] >= 3
+
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        summaries = {
+            row["name"]: row
+            for row in conn.execute(
+                "SELECT w.name, s.* FROM workflow_summaries AS s "
+                "JOIN workflows AS w ON w.id = s.workflow_id"
+            )
+        }
+    assert summaries["wf-expired"]["latest_release"] is None
+    assert summaries["wf-expired"]["release_count"] == 0
+    assert summaries["wf-expired"]["last_run_id"] is None
+    assert summaries["wf-expired"]["last_run_at"] is None
+    assert summaries["wf-recent"]["latest_release"] == recent
+    assert summaries["wf-recent"]["release_count"] == 1
+    assert summaries["wf-recent"]["last_run_id"] == f"wf-recent-{recent}"
+
+
+def test_workflow_query_budget(client):
+    client.post("/api/v1/workflow/", json={**WORKFLOW, "name": "wf-budget"})
+
+    # NOTE: The number of statements does not grow with the number of logs.
+    for release, size in ((20240902093600, 1), (20240902093900, 100)):
+        response = client.post(
+            "/api/v1/workflow/wf-budget/release",
+            json={
+                "release": str(release),
+                "logs": [
+                    {"run_id": f"budget-{release}-{i}", "context": {}}
+                    for i in range(size)
+                ],
+            },
+        )
+        assert response.status_code == 200
+        assert_max_queries(response, 4)
+
+    response = client.get("/api/v1/workflow/", params={"limit": 100})
+    assert response.status_code == 200
+    assert_max_queries(response, 1)
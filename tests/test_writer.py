@@ -0,0 +1,86 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from ddeutil.observe.db import DBSessionManager
+from ddeutil.observe.profiler import count_queries
+from ddeutil.observe.writer import WriteQueue
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+def insert(value: int):
+    async def op(session):
+        await session.execute(text(f"INSERT INTO t VALUES ({value})"))
+        return value
+
+    return op
+
+
+async def failed(session):
+    await session.execute(text("INSERT INTO missing VALUES (1)"))
+
+
+def test_write_queue(tmp_path: Path):
+    manager = DBSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}")
+
+    async def scenario():
+        async with manager.connect() as conn:
+            await conn.execute(text("CREATE TABLE t (id INTEGER)"))
+
+        queue = WriteQueue(manager=manager, batch_size=10)
+        queue.start()
+        ops = [insert(i) for i in range(20)]
+        ops.insert(5, failed)
+        results = await asyncio.gather(
+            *(queue.submit(op) for op in ops), return_exceptions=True
+        )
+        await queue.stop()
+
+        async with manager.session() as session:
+            count = (
+                await session.execute(text("SELECT COUNT(*) FROM t"))
+            ).scalar()
+        await manager.close()
+        return queue, results, count
+
+    queue, results, count = asyncio.run(scenario())
+    assert isinstance(results.pop(5), OperationalError)
+    assert results == list(range(20))
+    assert count == 20
+    assert not queue.is_running()
+
+    stats = queue.stats()
+    assert stats["writes"] == 20
+    assert stats["failed"] == 1
+    assert stats["batches"] == 3
+    assert stats["retried_batches"] == 1
+    assert stats["batch_size"]["max"] == 10
+
+
+def test_write_queue_not_start():
+    with pytest.raises(RuntimeError):
+        asyncio.run(WriteQueue().submit(failed))
+
+
+def test_write_queue_count_queries(tmp_path: Path):
+    manager = DBSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}")
+
+    async def request(value: int):
+        with count_queries() as queries:
+            await queue.submit(insert(value))
+        return queries.queries
+
+    async def scenario():
+        async with manager.connect() as conn:
+            await conn.execute(text("CREATE TABLE t (id INTEGER)"))
+        queue.start()
+        counts = await asyncio.gather(*(request(i) for i in range(5)))
+        await queue.stop()
+        await manager.close()
+        return counts
+
+    queue = WriteQueue(manager=manager, batch_size=10)
+    assert asyncio.run(scenario()) == [1] * 5
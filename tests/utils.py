@@ -193,5 +193,16 @@ async def initial_db(db_path: Path | None = None) -> None:
     await session.close()
 
 
+def assert_max_queries(response, limit: int) -> None:
+    """Assert the number of SQL statements that a request issued, from its
+    ``X-DB-Queries`` header, does not more than the query budget.
+    """
+    queries: int = int(response.headers["X-DB-Queries"])
+    assert queries <= limit, (
+        f"{response.request.method} {response.request.url.path} issued "
+        f"{queries} SQL statements, over its budget of {limit}."
+    )
+
+
 if __name__ == "__main__":
     asyncio.run(initial_db())